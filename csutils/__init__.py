@@ -2,12 +2,56 @@
 #######################################################################################
 # Collection of Python modules to ease basic tasks on textfiles.
 #
+# Submodules are imported on first access of one of their public names, so tools only
+# using one module don't pay for importing the others (e.g. 'from csutils import Colors'
+# only imports the cterm module).
+#
 # @package: csutils
 # @author:  cwsoft
 # @python:  3.8 or higher
 #######################################################################################
 """
-from .textparser import *
-from .cterm import *
+import importlib
 
 __version__ = "1.0.0"
+
+# Public names of the package and the submodules providing them.
+_SUBMODULES = {
+    "Textparser": "textparser",
+    "TextWriter": "textparser",
+    "TextRenderer": "textrender",
+    "Ansi": "cterm",
+    "Colors": "cterm",
+    "Styles": "cterm",
+    "Cursor": "cterm",
+    "Terminal": "cterm",
+    "TerminalState": "cterm",
+    "Screen": "cterm",
+    "Canvas": "cterm",
+    "Progress": "cterm",
+    "BackgroundWriter": "cterm",
+}
+
+__all__ = list(_SUBMODULES)
+
+# Submodules accessible as package attributes (e.g. csutils.cterm) without importing them explicitly.
+_MODULES = ("textparser", "cterm", "textrender", "cli")
+
+
+def __getattr__(name):
+    """Import the submodule providing the requested public name (or the requested submodule) on first access."""
+    if name in _MODULES:
+        # Importing a submodule binds it as package attribute.
+        return importlib.import_module(f".{name}", __name__)
+
+    if name not in _SUBMODULES:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    value = getattr(importlib.import_module(f".{_SUBMODULES[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Return module attributes including the lazily imported public names and submodules."""
+    return sorted(set(globals()) | set(__all__) | set(_MODULES))
@@ -0,0 +1,15 @@
+"""
+#######################################################################################
+# Entry point to run the csutils command line interface via 'python -m csutils'.
+#
+# @package: csutils
+# @author:  cwsoft
+# @python:  3.8 or higher
+#######################################################################################
+"""
+import sys
+
+from .cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+#######################################################################################
+# Module: bench_cterm.py
+# This module benchmarks the output cost of the cterm module against a fake terminal.
+#
+# Usage:  python bench_cterm.py [--items 10000] [--scenarios table,refresh] [--baseline old.json]
+#
+# @package: csutils.benchmarks
+# @author:  cwsoft
+# @python:  3.8 or higher
+#######################################################################################
+"""
+from contextlib import nullcontext
+import sys
+
+import benchutils
+from csutils.cterm import Canvas, Colors, Cursor, Progress, Screen, Styles, Terminal
+
+# Colors cycled through by the scenarios writing colored output.
+COLORS = (Colors.RED, Colors.GREEN, Colors.YELLOW, Colors.BLUE, Colors.CYAN, Colors.RESET)
+
+
+class FakeTerminal:
+    """Text stream counting write calls, flushes and written bytes (cterm output is ASCII) instead of writing."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Reset all counters."""
+        self.writes, self.flushes, self.bytes = 0, 0, 0
+
+    def write(self, text):
+        self.writes += 1
+        self.bytes += len(text)
+        return len(text)
+
+    def flush(self):
+        self.flushes += 1
+
+    def isatty(self):
+        return True
+
+
+def write_table(rows, cols, tracked=False, screen=False):
+    """Write a table with colored cells and a bold header row via Terminal.write."""
+    Terminal.track_state(tracked)
+    try:
+        with Screen() if screen else nullcontext():
+            for row in range(rows):
+                for col in range(cols):
+                    styles = Styles.BOLD if row == 0 else None
+                    Terminal.write(f"{row * col:>9}", forecolor=COLORS[col % len(COLORS)], styles=styles)
+                Terminal.set_style(Styles.RESET)
+                Terminal.write("\n")
+    finally:
+        Terminal.track_state(False)
+
+
+def refresh_screen(frames, rows, cols, screen=False):
+    """Redraw all rows of a screen per frame with Cursor.set_pos and Terminal.write (optionally one write per frame)."""
+    for frame in range(frames):
+        with Screen() if screen else nullcontext():
+            for row in range(1, rows + 1):
+                Cursor.set_pos(row=row, col=1)
+                Terminal.write(f"{row:3d}: {frame:<8d}".ljust(cols, "."), forecolor=COLORS[row % len(COLORS)])
+
+
+def refresh_canvas(canvas, frames, rows, cols):
+    """Redraw the same screen content as refresh_screen via a Canvas, which only writes changed cells."""
+    canvas.invalidate()
+    for frame in range(frames):
+        for row in range(1, rows + 1):
+            canvas.put(row, 1, f"{row:3d}: {frame:<8d}".ljust(cols, "."), forecolor=COLORS[row % len(COLORS)])
+        canvas.flush()
+
+
+def progress_naive(items):
+    """Show the progress by writing a status text per processed item."""
+    for item in range(1, items + 1):
+        Cursor.store_pos()
+        Terminal.write(f"{item}/{items}", row=1, col=1, forecolor=Colors.GREEN)
+        Cursor.restore_pos()
+
+
+def progress_widget(items, stream):
+    """Show the progress of the processed items via a Progress display (updates are counter increments)."""
+    with Progress(refresh=10, stream=stream) as progress:
+        task = progress.add_task("Items", total=items)
+        for _ in range(items):
+            task.advance()
+
+
+def get_scenarios(args, stream):
+    """Return dict with benchmark names and tuples (callable, number of operations per call)."""
+    rows, cols, frames, items = args.rows, args.cols, args.frames, args.items
+    tableRows = max(1, items // 8)
+    canvas = Canvas(rows, cols)
+    return {
+        "table": (lambda: write_table(tableRows, 8), tableRows * 8),
+        "table:tracked": (lambda: write_table(tableRows, 8, tracked=True), tableRows * 8),
+        "table:screen": (lambda: write_table(tableRows, 8, screen=True), tableRows * 8),
+        "refresh": (lambda: refresh_screen(frames, rows, cols), frames),
+        "refresh:screen": (lambda: refresh_screen(frames, rows, cols, screen=True), frames),
+        "refresh:canvas": (lambda: refresh_canvas(canvas, frames, rows, cols), frames),
+        "progress:naive": (lambda: progress_naive(items), items),
+        "progress:widget": (lambda: progress_widget(items, stream), items),
+        "set_color": (lambda: [Terminal.set_color(COLORS[idx % 6], Colors.RESET) for idx in range(items)], items),
+        "set_style": (lambda: [Terminal.set_style(Styles.BOLD, Styles.UNDERLINE) for _ in range(items)], items),
+        "cursor": (lambda: [Cursor.set_pos(row=idx % rows + 1, col=idx % cols + 1) for idx in range(items)], items),
+    }
+
+
+def main(argv=None):
+    """Run all benchmarks against a fake terminal and save the results."""
+    parser = benchutils.get_parser(__doc__.splitlines()[3][2:], output="bench_cterm.json")
+    parser.add_argument("--items", type=int, default=10000, help="number of operations of the item based scenarios")
+    parser.add_argument("--frames", type=int, default=50, help="number of frames of the refresh scenarios")
+    parser.add_argument("--rows", type=int, default=24, help="number of rows of the fake terminal")
+    parser.add_argument("--cols", type=int, default=80, help="number of cols of the fake terminal")
+    parser.add_argument("--scenarios", help="comma separated benchmark names (default: all)")
+    args = parser.parse_args(argv)
+
+    stream, results = FakeTerminal(), {}
+    Terminal.set_output(stream, ansi=True)
+    try:
+        scenarios = get_scenarios(args, stream)
+        names = [name.strip() for name in args.scenarios.split(",")] if args.scenarios else list(scenarios)
+        for name in names:
+            operation, count = scenarios[name]
+            result = benchutils.measure(operation, args.repeat, not args.no_memory)
+
+            # Output cost is counted during an extra run, so counting doesn't depend on the number of repeats.
+            stream.reset()
+            operation()
+            result["ops_per_sec"] = round(count / result["best"], 1) if result["best"] else None
+            result["bytes_per_op"] = round(stream.bytes / count, 2)
+            result["writes_per_op"] = round(stream.writes / count, 4)
+            results[name] = result
+    finally:
+        Terminal.set_output()
+
+    width = max([len(name) for name in results] + [10])
+    print(f"{'benchmark':{width}}  {'ops/s':>12}  {'bytes/op':>12}  {'writes/op':>12}")
+    for name, result in results.items():
+        ops, size, writes = result["ops_per_sec"], result["bytes_per_op"], result["writes_per_op"]
+        print(f"{name:{width}}  {ops:12.0f}  {size:12.2f}  {writes:12.4f}")
+    print()
+
+    meta = benchutils.get_meta(items=args.items, frames=args.frames, rows=args.rows, cols=args.cols, repeat=args.repeat)
+    return benchutils.finish(args, results, meta)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+#######################################################################################
+# Module: bench_import.py
+# This module benchmarks the cold start import time of the csutils package and modules.
+#
+# Usage:  python bench_import.py [--repeat 20] [--baseline old.json]
+#
+# @package: csutils.benchmarks
+# @author:  cwsoft
+# @python:  3.8 or higher
+#######################################################################################
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+from pathlib import Path
+
+import benchutils
+
+# Imports measured in fresh interpreter processes (cold start).
+IMPORTS = {
+    "csutils": "import csutils",
+    "csutils.textparser": "import csutils.textparser",
+    "csutils.cterm": "import csutils.cterm",
+    "csutils.cli": "import csutils.cli",
+    "from csutils import Textparser": "from csutils import Textparser",
+    "from csutils import Colors": "from csutils import Colors",
+    "from csutils import *": "from csutils import *",
+}
+
+
+def get_import_time(statement, env, cwd):
+    """Return time in seconds of executing the import statement in a fresh interpreter, measured inside the
+    interpreter, so the startup and the modules imported by the interpreter itself are not included.
+    Note: 'python -X importtime' doesn't report modules imported via importlib.import_module, which is used
+    by the lazy loading of the package, so it can't be used to measure e.g. 'from csutils import Textparser'."""
+    code = f"import time; start = time.perf_counter(); {statement}; print(time.perf_counter() - start)"
+    command = [sys.executable, "-c", code]
+    stdout = subprocess.run(command, env=env, cwd=cwd, stdout=subprocess.PIPE, universal_newlines=True, check=True)
+    return float(stdout.stdout.strip())
+
+
+def main(argv=None):
+    """Measure the import time of each statement in fresh interpreters and save the results."""
+    parser = benchutils.get_parser(__doc__.splitlines()[3][2:], output="bench_import.json")
+    parser.set_defaults(repeat=20)
+    args = parser.parse_args(argv)
+
+    # Run all imports from an empty folder with the package folder on the path. A first run of each statement
+    # writes the bytecode cache, so the timings measure imports from cached bytecode like installed packages.
+    env = dict(os.environ, PYTHONPATH=str(Path(__file__).resolve().parents[2]))
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        for name, statement in IMPORTS.items():
+            get_import_time(statement, env, folder)
+            timings = [get_import_time(statement, env, folder) for _ in range(max(1, args.repeat))]
+            results[name] = {"best": min(timings), "mean": sum(timings) / len(timings)}
+
+    meta = benchutils.get_meta(repeat=args.repeat)
+    return benchutils.finish(args, results, meta)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
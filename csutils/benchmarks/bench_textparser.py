@@ -0,0 +1,89 @@
+"""
+#######################################################################################
+# Module: bench_textparser.py
+# This module benchmarks the hot paths of the Textparser class on synthetic textfiles.
+#
+# Usage:  python bench_textparser.py [--lines 100000] [--shapes short,table] [--baseline old.json]
+#
+# @package: csutils.benchmarks
+# @author:  cwsoft
+# @python:  3.8 or higher
+#######################################################################################
+"""
+import random
+import sys
+import tempfile
+
+from pathlib import Path
+
+import benchutils
+from csutils.textparser import Textparser
+
+# Keyword searched by the benchmarks, inserted into the synthetic lines with the hit rate of the shape.
+KEYWORD = "Frequency"
+
+
+def generate_lines(shape, lines, seed=0):
+    """Yield 'lines' synthetic textlines of the given shape. Supported shapes:
+    short (~20 chars), long (~400 chars), dense (every 2nd line is a hit), sparse (every 1000th line is a hit),
+    table (20 whitespace separated columns), fixed (fixed-width records with 10 columns of 8 chars)."""
+    rnd = random.Random(seed)
+    hitRate = {"dense": 0.5, "sparse": 0.001}.get(shape, 0.05)
+    for idx in range(lines):
+        hit = rnd.random() < hitRate
+        if shape == "long":
+            words = [f"word{rnd.randrange(1000)}" for _ in range(50)]
+            if hit:
+                words[rnd.randrange(50)] = KEYWORD
+            yield " ".join(words) + "\n"
+        elif shape == "table":
+            yield "  ".join([f"{rnd.uniform(-1e3, 1e3):10.3f}" for _ in range(20)]) + "\n"
+        elif shape == "fixed":
+            yield "".join([f"{rnd.randrange(10 ** 7):8d}" for _ in range(10)]) + "\n"
+        else:
+            yield f"{KEYWORD if hit else 'Amplitude'} = {rnd.randrange(100)} Hz ({idx})\n"
+
+
+def get_operations(tp, lines):
+    """Return dict with benchmark names and callables exercising the Textparser hot paths."""
+    half = lines // 2
+    return {
+        "get_lines:all": lambda: tp.get_lines(),
+        "get_lines:multi_slice": lambda: tp.get_lines(rows=f"0:{half}, {half}:{lines}"),
+        "get_lines:indices": lambda: tp.get_lines(rows=list(range(0, lines, 10))),
+        "get_values:split": lambda: tp.get_values(rows=f"0:{half}", cols="0, 2"),
+        "get_values:fixed": lambda: tp.get_values(rows=f"0:{half}", cols="0:8,8:16,16:24"),
+        "get_matches:literal": lambda: tp.get_matches(pattern=KEYWORD.lower()),
+        "get_matches:literal_case": lambda: tp.get_matches(pattern=KEYWORD, ignoreCase=False),
+        "get_matches:regex": lambda: tp.get_matches(pattern=r"rx:freq\w+ = \d{2} "),
+        "get_matches:subpatterns": lambda: tp.get_matches(pattern=KEYWORD, subpatterns=[(-1, "Hz"), (1, "rx:\\d")]),
+        "_do_subpattern_match": lambda: [tp._do_subpattern_match(idx, (1, "rx:[0-9]"), True) for idx in range(lines)],
+    }
+
+
+def main(argv=None):
+    """Generate synthetic textfiles, run all benchmarks and save the results."""
+    parser = benchutils.get_parser(__doc__.splitlines()[3][2:], output="bench_textparser.json")
+    parser.add_argument("--lines", type=int, default=100000, help="number of lines per synthetic file")
+    parser.add_argument("--shapes", default="short,long,dense,sparse,table,fixed", help="comma separated shapes")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic data generator")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        for shape in [shape.strip() for shape in args.shapes.split(",")]:
+            path = Path(folder) / f"{shape}.txt"
+            with Textparser.open_writer(path, append=False) as writer:
+                writer.write(generate_lines(shape, args.lines, args.seed))
+
+            operations = {"from_source": lambda: Textparser(path)}
+            operations.update(get_operations(Textparser(path), args.lines))
+            for name, operation in operations.items():
+                results[f"{shape}/{name}"] = benchutils.measure(operation, args.repeat, not args.no_memory)
+
+    meta = benchutils.get_meta(lines=args.lines, shapes=args.shapes, seed=args.seed, repeat=args.repeat)
+    return benchutils.finish(args, results, meta)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+#######################################################################################
+# Module: benchutils.py
+# This module contains helpers shared by the csutils benchmark scripts to measure
+# runtime and peak memory, store results as JSON and compare them with a baseline.
+#
+# @package: csutils.benchmarks
+# @author:  cwsoft
+# @python:  3.8 or higher
+#######################################################################################
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from datetime import datetime
+from pathlib import Path
+
+# Monkey patch system path so we can access the csutils package without installing it.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+
+def get_parser(description, output):
+    """Return argument parser with the options shared by all benchmark scripts."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark, the best run is reported")
+    parser.add_argument("--output", default=output, help="JSON file to store the results in")
+    parser.add_argument("--baseline", help="JSON file with saved results to compare against")
+    parser.add_argument("--threshold", type=float, default=1.1, help="time ratio reported as regression")
+    parser.add_argument("--no-memory", action="store_true", help="skip the (slow) peak memory measurement")
+    return parser
+
+
+def measure(func, repeat=5, memory=True):
+    """Return dict with best and mean runtime in seconds of calling func() 'repeat' times and the peak
+    memory in KiB allocated during an extra traced call (tracemalloc slows down the call itself)."""
+    timings = []
+    for _ in range(max(1, repeat)):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    result = {"best": min(timings), "mean": sum(timings) / len(timings)}
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        func()
+        result["peak_kib"] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        tracemalloc.stop()
+    return result
+
+
+def get_meta(**settings):
+    """Return dict describing the environment and settings the benchmarks were run with."""
+    return {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "settings": settings,
+    }
+
+
+def finish(args, results, meta):
+    """Print and save results as JSON and compare them with the baseline results if specified.
+    Return exit code 1 if any benchmark is slower than the baseline by more than args.threshold."""
+    width = max([len(name) for name in results] + [10])
+    print(f"{'benchmark':{width}}  {'best [ms]':>12}  {'mean [ms]':>12}  {'peak [KiB]':>12}")
+    for name, result in results.items():
+        peak = result.get("peak_kib", "-")
+        print(f"{name:{width}}  {result['best'] * 1e3:12.3f}  {result['mean'] * 1e3:12.3f}  {peak:>12}")
+
+    with Path(args.output).open(mode="w") as outfile:
+        json.dump({"meta": meta, "results": results}, outfile, indent=2)
+    print(f"\nResults saved to '{args.output}'.")
+
+    if not args.baseline:
+        return 0
+
+    baseline = json.loads(Path(args.baseline).read_text())["results"]
+    regressions = 0
+    print(f"\nComparison with baseline '{args.baseline}' (ratio = actual / baseline):")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        if baseline[name]["best"]:
+            ratio = result["best"] / baseline[name]["best"]
+        else:
+            # Benchmarks too fast to be measured are only a regression if they became measurable.
+            ratio = float("inf") if result["best"] else 1.0
+        flag = " <-- REGRESSION" if ratio > args.threshold else ""
+        regressions += bool(flag)
+        print(f"{name:{width}}  {ratio:8.2f}{flag}")
+    return 1 if regressions else 0
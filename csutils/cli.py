@@ -0,0 +1,213 @@
+"""
+#######################################################################################
+# Command line interface of the csutils package. Run 'python -m csutils --help' or the
+# 'csutils' console script for details. Supported subcommands:
+#   grep:   Output rows matching a pattern (optional subpatterns and 'rx:' regex).
+#   lines:  Output rows defined by row indices.
+#   values: Output column values of rows defined by row and column indices (optionally aligned).
+#   block:  Output blocks of rows starting and ending with rows matching two patterns.
+#
+# Inputs can be files, glob patterns (e.g. 'logs/**/*.gz') or '-' for stdin (default).
+# Multiple files are processed in parallel, output is written in buffered chunks.
+#
+# @package: csutils.cli
+# @author:  cwsoft
+# @python:  3.8 or higher
+#######################################################################################
+"""
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import glob
+import os
+import re
+import sys
+
+from .textparser import Textparser, TextWriter
+from .textrender import TextRenderer
+
+__version__ = "1.0.0"
+
+
+def main(argv=None):
+    """Run the command line interface with the given arguments (default: sys.argv[1:]).
+    Return exit code 0 if any output was produced, 1 if nothing was found and 2 on errors or missing inputs."""
+    parser = _get_parser()
+    args = parser.parse_args(argv)
+    try:
+        args.subpatterns = [_get_subpattern(sub) for sub in getattr(args, "sub", [])] or None
+    except ValueError as error:
+        parser.error(str(error))
+
+    sources, missing = _get_sources(args.inputs)
+    for item in missing:
+        print(f"csutils: {item}: no such file or no files matching the pattern", file=sys.stderr)
+    if not sources:
+        return 2
+
+    color = getattr(args, "color", "never")
+    args.color = color == "always" or (color == "auto" and sys.stdout.isatty() and not os.environ.get("NO_COLOR"))
+    args.filename = args.with_filename if args.with_filename is not None else len(sources) > 1
+    jobs = max(1, min(args.jobs or os.cpu_count() or 1, len(sources)))
+
+    found, writer = False, TextWriter(sys.stdout, bufferSize=args.buffer_size)
+    try:
+        # Results are written in the order of the sources, while the sources are processed in parallel.
+        if jobs == 1 or "-" in sources:
+            outputs = (_process(source, args) for source in sources)
+            for output in outputs:
+                found |= bool(output)
+                writer.write(output)
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                for output in executor.map(_process, sources, [args] * len(sources)):
+                    found |= bool(output)
+                    writer.write(output)
+        writer.close()
+    except BrokenPipeError:
+        # Output was closed by the receiving process (e.g. 'head'), so silence the final flush of stdout.
+        sys.stdout = open(os.devnull, mode="w")
+        return 0
+    except (OSError, ValueError, IndexError, re.error) as error:
+        writer.close()
+        print(f"csutils: {error}", file=sys.stderr)
+        return 2
+
+    # Like grep, missing inputs are reported as error even if other inputs produced output.
+    return 2 if missing else (0 if found else 1)
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# FUNCTIONS BELOW SHOULD BE TREATED AS PRIVATE FUNCTIONS (IMPLEMENTATION DETAILS)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+def _get_parser():
+    """Return argument parser with all subcommands and their options."""
+    parser = argparse.ArgumentParser(prog="csutils", description="Search and extract data from textfiles.")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+
+    grep = commands.add_parser("grep", help="output rows matching a pattern")
+    grep.add_argument("pattern", help="search pattern, patterns starting with 'rx:' are regular expressions")
+    grep.add_argument(
+        "--sub",
+        action="append",
+        default=[],
+        metavar="OFFSET:PATTERN",
+        help="subpattern matching the row at OFFSET relative to the hit, e.g. --sub=-1:rx:[0-9]{2} (repeatable)",
+    )
+    grep.add_argument("--first", action="store_true", help="output the first matching row per input only")
+    _add_match_arguments(grep)
+
+    lines = commands.add_parser("lines", help="output rows defined by row indices")
+    lines.add_argument("rows", help="row indices like '1', '1,2,5' or '0:10,50:100'")
+
+    values = commands.add_parser("values", help="output column values of rows")
+    values.add_argument("rows", help="row indices like '1', '1,2,5' or '0:10,50:100'")
+    values.add_argument("--cols", default=":", help="column indices or multi-slices like '0:3,3:6' (default: all)")
+    values.add_argument("--sep", help="column separator (default: whitespace)")
+    values.add_argument("--merge", default=" ", help="string joining column values (default: ' ')")
+    values.add_argument("--align", action="store_true", help="align columns as table (ignores --merge)")
+
+    block = commands.add_parser("block", help="output blocks of rows between rows matching two patterns")
+    block.add_argument("start", help="pattern of the first row of a block")
+    block.add_argument("end", help="pattern of the last row of a block")
+    _add_match_arguments(block)
+
+    for command in (grep, lines, values, block):
+        _add_input_arguments(command)
+    return parser
+
+
+def _add_match_arguments(parser):
+    """Add options of the subcommands searching for patterns."""
+    parser.add_argument("-s", "--case-sensitive", action="store_true", help="perform case sensitive searches")
+    parser.add_argument("-n", "--line-numbers", action="store_true", help="prefix output with row indices")
+    parser.add_argument("--color", choices=("auto", "always", "never"), default="auto", help="colorize hits")
+
+
+def _add_input_arguments(parser):
+    """Add the input files and the options shared by all subcommands."""
+    parser.add_argument("inputs", nargs="*", default=["-"], help="files or glob patterns, '-' for stdin (default)")
+    parser.add_argument("-j", "--jobs", type=int, default=0, help="number of parallel processes (default: CPUs)")
+    parser.add_argument("-H", "--with-filename", action="store_true", default=None, help="prefix output with file")
+    parser.add_argument("--no-filename", dest="with_filename", action="store_false", help="never prefix filenames")
+    parser.add_argument("--mode", choices=("text", "bytes"), default="text", help="Textparser mode (default: text)")
+    parser.add_argument("--encoding", help="encoding of the inputs (default: platform/utf-8)")
+    parser.add_argument("--errors", default="strict", help="decoding error handler (default: strict)")
+    parser.add_argument("--buffer-size", type=int, default=1 << 16, help="output buffer size in characters")
+
+
+def _get_sources(inputs):
+    """Return tuple with the list of files matching the given inputs (files or glob patterns) in the given order
+    and the list of inputs matching no file. The stdin marker '-' is kept as it is."""
+    sources, missing = [], []
+    for item in inputs:
+        if item == "-" or os.path.exists(item):
+            sources.append(item)
+            continue
+
+        paths = sorted(path for path in glob.glob(item, recursive=True) if os.path.isfile(path))
+        sources.extend(paths)
+        if not paths:
+            missing.append(item)
+    return sources, missing
+
+
+def _process(source, args):
+    """Return output string of the subcommand for a single source (file path or '-' for stdin)."""
+    if source == "-":
+        tp = Textparser.from_stream(sys.stdin.buffer, args.mode, args.encoding, args.errors)
+    else:
+        tp = Textparser.from_file(source, args.mode, args.encoding, args.errors)
+
+    name = "(stdin)" if source == "-" else source
+    renderer = TextRenderer(
+        color=args.color,
+        lineNumbers=getattr(args, "line_numbers", False),
+        name=name if args.filename else None,
+        ignoreCase=not getattr(args, "case_sensitive", False),
+    )
+    if args.command == "grep":
+        matches = tp.get_matches(args.pattern, args.subpatterns, not args.case_sensitive, findAll=not args.first)
+        return renderer.render_matches(matches, args.pattern)
+
+    if args.command == "lines":
+        output = tp.get_lines(args.rows)
+        return "".join([renderer.format_row(None, line) for line in output.splitlines()])
+
+    if args.command == "values":
+        if args.align:
+            return renderer.render_table(tp.get_values(args.rows, args.cols, args.sep, "\0"), sep="\0")
+        output = tp.get_values(args.rows, args.cols, args.sep, args.merge)
+        return "".join([renderer.format_row(None, line) for line in output.splitlines()])
+
+    return _get_blocks(tp, renderer, args)
+
+
+def _get_blocks(tp, renderer, args):
+    """Return all blocks of rows from a row matching args.start up to the next row matching args.end.
+    Blocks are separated by a line containing '--'. Rows matching args.start within a block are skipped."""
+    ignoreCase = not args.case_sensitive
+    ends = [row for row, _ in tp.get_matches(args.end, ignoreCase=ignoreCase) if row is not None]
+    blocks, last = [], -1
+    for start, _ in tp.get_matches(args.start, ignoreCase=ignoreCase):
+        if start is None or start <= last:
+            continue
+
+        idx = bisect_right(ends, start)
+        if idx == len(ends):
+            break
+
+        last = ends[idx]
+        # Rows are fetched one by one, as get_lines would strip trailing empty rows of the block.
+        blocks.append("".join([renderer.format_row(row, tp.get_lines(row)) for row in range(start, last + 1)]))
+    return "--\n".join(blocks)
+
+
+def _get_subpattern(sub):
+    """Return subpattern tuple (rowOffset, pattern) from a command line string 'OFFSET:PATTERN'."""
+    offset, _, pattern = sub.partition(":")
+    if not re.fullmatch(r"[+-]?\d+", offset.strip()) or not pattern:
+        raise ValueError(f"invalid subpattern '{sub}', expected 'OFFSET:PATTERN'")
+    return (int(offset), pattern)
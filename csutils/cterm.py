@@ -1,7 +1,10 @@
 """
 #######################################################################################
 # Module for basic terminal color and cursor manipulations via an easy to use API.
-# Under the hood ANSI escape sequences are printed to stdout of the terminal.
+# Under the hood ANSI escape sequences are printed to stdout of the terminal or to the
+# output set via Terminal.set_output (e.g. a BackgroundWriter writing from its own thread).
+# If the output is no terminal or the NO_COLOR environment variable is set, escape sequences
+# are skipped and only plain text is written.
 #
 # Some details about ANSI escape sequences can be found here:
 # - https://de.wikipedia.org/wiki/ANSI-Escapesequenz
@@ -14,10 +17,34 @@
 #######################################################################################
 """
 
+from contextlib import nullcontext
 from enum import Enum
+import atexit
+import functools
+import os
+import queue
+import sys
+import threading
+import time
 
 __version__ = "1.1.0"
 
+__all__ = [
+    "Ansi",
+    "Colors",
+    "Styles",
+    "Cursor",
+    "Terminal",
+    "TerminalState",
+    "Screen",
+    "Canvas",
+    "Progress",
+    "BackgroundWriter",
+]
+
+# Stack of Screen buffers activated by the calling thread (see Screen and _write).
+_screens = threading.local()
+
 
 class Ansi(Enum):
     """Basic ANSI control sequences."""
@@ -57,53 +84,74 @@ class Styles(Enum):
     REVERSE = 7
 
 
+# Precomputed escape sequence intro and SGR codes, so no Enum values are converted on each call.
+_CSI = Ansi.CSI.value
+_FORE_CODES = {color: str(color.value) for color in Colors}
+_BACK_CODES = {color: str(color.value + 10) for color in Colors}
+_STYLE_CODES = {style: str(style.value) for style in Styles}
+
+# Default terminal attributes (forecolor, backcolor, styles) and empty canvas cell (character, *attributes).
+_DEFAULT = (Colors.RESET, Colors.RESET, frozenset())
+_BLANK = (" ", *_DEFAULT)
+
+
 class Cursor:
-    """Static class allowing basic cursor operations supported by most terminals."""
+    """Static class allowing basic cursor operations supported by most terminals.
+    All methods are no-ops if ANSI escape sequences are disabled (see Terminal.set_output)."""
 
     @staticmethod
     def disable():
         """Disable (hide) terminal cursor."""
-        print(f"{Ansi.CSI.value}?25l", end="")
+        if Terminal._ansi:
+            _write(f"{_CSI}?25l")
 
     @staticmethod
     def enable():
         """Enables (show) terminal cursor."""
-        print(f"{Ansi.CSI.value}?25h", end="")
+        if Terminal._ansi:
+            _write(f"{_CSI}?25h")
 
     @staticmethod
     def store_pos():
         """Store actual cursor position in memory."""
-        print(f"{Ansi.CSI.value}s", end="")
+        if Terminal._ansi:
+            _write(f"{_CSI}s")
 
     @staticmethod
     def restore_pos():
         """Restore cursor position from last stored position in memory."""
-        print(f"{Ansi.CSI.value}u", end="")
+        if Terminal._ansi:
+            _write(f"{_CSI}u")
 
     @staticmethod
     def set_pos(row=1, col=1):
         """Set cursor position to specified terminal row, col coordinates."""
-        print(f"{Ansi.CSI.value}{row};{col}f", end="")
+        if Terminal._ansi:
+            _write(f"{_CSI}{row};{col}f")
 
     @staticmethod
     def up(pos=1):
         """Move cursor up by pos rows."""
-        print(f"{Ansi.CSI.value}{pos}A", end="")
+        if Terminal._ansi:
+            _write(f"{_CSI}{pos}A")
 
     @staticmethod
     def down(pos=1):
         """Move cursor down by pos rows."""
-        print(f"{Ansi.CSI.value}{pos}B", end="")
+        if Terminal._ansi:
+            _write(f"{_CSI}{pos}B")
 
     @staticmethod
     def right(pos=1):
         """Move cursor to the right by pos cols (assuming LTR languages)."""
-        print(f"{Ansi.CSI.value}{pos}C", end="")
+        if Terminal._ansi:
+            _write(f"{_CSI}{pos}C")
 
     @staticmethod
     def left(pos=1):
         """Move cursor to the left by n-cols (assuming LTR languages)."""
-        print(f"{Ansi.CSI.value}{pos}D", end="")
+        if Terminal._ansi:
+            _write(f"{_CSI}{pos}D")
 
 
 class Terminal:
@@ -116,6 +164,15 @@ class Terminal:
         BEGINN_TO_POS = 1
         ALL = 2
 
+    # Skip escape sequences not changing the colors and styles tracked in the module state (see track_state).
+    _tracking = False
+
+    # Text stream all output is written to if no Screen is active (None:=sys.stdout at the time of writing).
+    _output = None
+
+    # Write ANSI escape sequences to the output (set by set_output, which is called when the module is loaded).
+    _ansi = True
+
     @staticmethod
     def initialize(forecolor=Colors.RESET, backcolor=Colors.RESET):
         """Initialize terminal window (reset colors, clear output, set cursor to top-left position."""
@@ -127,65 +184,650 @@ class Terminal:
     def clear(mode=Clear.ALL):
         """Clear terminal screen. Mode must be of Enum Terminal.Clear."""
         assert isinstance(mode, Terminal.Clear), "Param 'mode' must be of Enum Terminal.Clear."
-        print(f"{Ansi.CSI.value}{mode.value}J")
+        if Terminal._ansi:
+            _write(f"{_CSI}{mode.value}J\n")
 
     @staticmethod
     def clear_line(mode=Clear.ALL):
         """Clear terminal screen. Mode must be of Enum Terminal.Clear."""
         assert isinstance(mode, Terminal.Clear), "Param 'mode' must be of Enum Terminal.Clear."
-        print(f"{Ansi.CSI.value}{mode.value}M")
+        if Terminal._ansi:
+            _write(f"{_CSI}{mode.value}M\n")
+
+    @staticmethod
+    def set_output(stream=None, ansi=None):
+        """Write all output of the Cursor, Terminal, Canvas and Progress methods to the given text stream, e.g. a
+        BackgroundWriter or an io.StringIO buffer. No stream resets the output to sys.stdout. ANSI escape sequences
+        are written if ansi is True. By default (None), they are only written if the output stream is a terminal
+        and the NO_COLOR environment variable is not set. Without escape sequences, positioning, color and style
+        methods do nothing and Terminal.write only writes the plain text."""
+        Terminal._output = stream
+        Terminal._ansi = _get_ansi_support(stream or sys.stdout) if ansi is None else bool(ansi)
+
+    @staticmethod
+    def track_state(enable=True):
+        """Enable or disable tracking of the colors and styles set via cterm. With tracking enabled, escape
+        sequences not changing the tracked state are skipped. Output not written via cterm (e.g. escape sequences
+        printed directly) can't be tracked, so call track_state() again to forget the state after such output."""
+        with _state_lock:
+            Terminal._tracking = enable
+            _state.invalidate()
 
     @staticmethod
     def set_color(forecolor=None, backcolor=None):
         """Set terminal fore- and background color to specified values. Colors must be of Enum Colors.
         Example: set_color(forecolor=Colors.RED, backcolor=Colors.YELLOW)."""
-        if not forecolor is None:
-            assert isinstance(forecolor, Colors), "Param 'forecolor' must be of Enum cterm.Colors."
-            print(f"{Ansi.CSI.value}{forecolor.value}m", end="")
+        if not Terminal._ansi:
+            return
 
-        if not backcolor is None:
-            assert isinstance(backcolor, Colors), "Param 'backcolor' must be of Enum cterm.Colors."
-            print(f"{Ansi.CSI.value}{int(backcolor.value) + 10}m", end="")
+        state, lock = _get_state()
+        with lock:
+            sequence = state.get_sequence(forecolor, backcolor)
+            if sequence:
+                _write(sequence)
 
     @staticmethod
     def set_style(*styles):
-        """Set terminal font styles to specified values. Font styles must be of Enum Styles.
-        Example: set_style(Styles.BOLD, Styles.UNDERLINE)."""
-        # Reset styles if no style was defined.
-        if not styles:
-            print(f"{Ansi.CSI.value}{Styles.RESET.value}m", end="")
+        """Set terminal font styles to specified values. Font styles must be of Enum Styles. No styles or
+        Styles.RESET resets all styles and colors. Example: set_style(Styles.BOLD, Styles.UNDERLINE)."""
+        if not Terminal._ansi:
             return
 
-        # Loop through style enum args and apply all styles in sequence.
-        for style in styles:
-            assert isinstance(style, Styles), "Param(s) 'styles' must be of Enum cterm.Styles."
-            print(f"{Ansi.CSI.value}{style.value}m", end="")
+        state, lock = _get_state()
+        with lock:
+            sequence = state.get_sequence(styles=styles or Styles.RESET)
+            if sequence:
+                _write(sequence)
 
     @staticmethod
     def write(text, row=None, col=None, forecolor=None, backcolor=None, styles=None, auto_reset=False):
         """Writes text to specified position with specified colors and styles. By default no line end is added.
-        Note: styles can be a single Enum cterm.Styles or a collection of Enum cterm.Styles."""
-        if auto_reset:
-            Cursor.store_pos()
+        Note: styles can be a single Enum cterm.Styles or a collection of Enum cterm.Styles.
+        All escape sequences and the text are composed into a single string written at once."""
+        if not Terminal._ansi:
+            _write(str(text))
+            return
+
+        output = [f"{_CSI}s"] if auto_reset else []
 
         # Set row and col position if specified.
         if isinstance(row, int) and isinstance(col, int):
-            Cursor.set_pos(max(1, row), max(1, col))
+            output.append(f"{_CSI}{max(1, row)};{max(1, col)}f")
+
+        # Set terminal colors and font styles if specified with a single escape sequence.
+        state, lock = _get_state()
+        with lock:
+            output.append(state.get_sequence(forecolor, backcolor, styles))
+
+            # Write text to terminal using optional position, colors and styles.
+            output.append(str(text))
+
+            # Reset colors, styles and cursor position if auto_reset is set.
+            if auto_reset:
+                output.append(state.get_sequence(styles=Styles.RESET))
+                output.append(f"{_CSI}u")
+            _write("".join(output))
+
+
+class TerminalState:
+    """Tracks the colors and styles of a terminal, so attribute changes are emitted as a single SGR sequence
+    (e.g. CSI 1;31;42m) containing only the codes actually changing the state. Unknown attributes are None.
+    Example:
+        state = TerminalState()
+        state.get_sequence(forecolor=Colors.RED, styles=Styles.BOLD)  # Returns CSI 31;1m.
+        state.get_sequence(forecolor=Colors.RED)  # Returns an empty string, as the state is unchanged.
+    """
+
+    def __init__(self):
+        """Initialize state with unknown colors and styles."""
+        self.invalidate()
+
+    def invalidate(self):
+        """Forget the tracked state, so the next requested attributes are emitted even if already set."""
+        self.forecolor = self.backcolor = self.styles = None
+
+    def get_sequence(self, forecolor=None, backcolor=None, styles=None):
+        """Return SGR sequence setting the given colors of Enum Colors and adding the given styles (a single
+        Enum Styles or a collection) and update the tracked state. Attributes set to None are kept as they are.
+        A leading Styles.RESET resets all colors and styles first, as the terminal does with SGR code 0. A later
+        Styles.RESET discards the given attributes before it, as the terminal would reset them in that order."""
+        styles = (styles,) if isinstance(styles, Styles) else tuple(styles or ())
+        if Styles.RESET in styles[1:]:
+            forecolor = backcolor = None
+            styles = styles[len(styles) - 1 - styles[::-1].index(Styles.RESET) :]
+        return self._get_sequence(forecolor, backcolor, _get_style_set(styles), Styles.RESET in styles)
+
+    def get_transition(self, forecolor, backcolor, styles):
+        """Return SGR sequence changing the state to exactly the given colors and styles (a frozenset of Enum
+        Styles) and update the tracked state. Removing a style requires to reset all attributes first."""
+        if self.forecolor is forecolor and self.backcolor is backcolor and self.styles == styles:
+            return ""
+        return self._get_sequence(forecolor, backcolor, styles, self.styles is None or not self.styles <= styles)
+
+    def _get_sequence(self, forecolor, backcolor, styles, reset):
+        """Return SGR sequence with the codes of the given attributes changing the tracked state."""
+        codes = []
+        if reset and (self.forecolor, self.backcolor, self.styles) != _DEFAULT:
+            codes.append(_STYLE_CODES[Styles.RESET])
+            self.forecolor, self.backcolor, self.styles = _DEFAULT
+
+        if forecolor is not None and forecolor is not self.forecolor:
+            assert isinstance(forecolor, Colors), "Param 'forecolor' must be of Enum cterm.Colors."
+            codes.append(_FORE_CODES[forecolor])
+            self.forecolor = forecolor
 
-        # Set terminal colors if specified.
-        Terminal.set_color(forecolor, backcolor)
+        if backcolor is not None and backcolor is not self.backcolor:
+            assert isinstance(backcolor, Colors), "Param 'backcolor' must be of Enum cterm.Colors."
+            codes.append(_BACK_CODES[backcolor])
+            self.backcolor = backcolor
+
+        if styles:
+            added = styles if self.styles is None else styles - self.styles
+            codes.extend([_STYLE_CODES[style] for style in Styles if style in added])
+            if self.styles is not None:
+                self.styles = self.styles | added
+        return _get_sgr_sequence(tuple(codes)) if codes else ""
+
+
+class Screen:
+    """Frame buffer collecting cterm output in memory, which is written to the terminal with a single write.
+    While a Screen is active (used as context manager), all Cursor and Terminal methods called by the same
+    thread write into the screen buffer. The buffer is flushed when leaving the context or calling flush().
+    Example:
+        with Screen() as screen:
+            Terminal.write("Status", row=1, col=1, forecolor=Colors.GREEN)
+            Cursor.set_pos(row=2, col=1)
+            screen.flush()  # Optional, e.g. at the end of each frame of a redraw loop.
+    """
+
+    def __init__(self, stream=None):
+        """Initialize empty screen buffer. Flushed output is written to the given text stream. By default, the
+        output is written to the enclosing active Screen (nested screens) or the output of the Terminal."""
+        self._stream, self._parent, self._buffer = stream, None, []
+
+    def __enter__(self):
+        """Activate screen buffer for all Cursor and Terminal methods called by this thread."""
+        stack = _get_screen_stack()
+        self._parent = stack[-1] if stack else None
+        stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Deactivate screen buffer and flush buffered output."""
+        stack = _get_screen_stack()
+        if self in stack:
+            stack.remove(self)
+        self.flush()
+
+    def write(self, text):
+        """Add text to the screen buffer. Allows to use a screen as file, e.g. print(text, file=screen)."""
+        self._buffer.append(text)
+
+    def getvalue(self):
+        """Return buffered output as string."""
+        return "".join(self._buffer)
+
+    def clear(self):
+        """Discard all buffered output."""
+        self._buffer.clear()
+
+    def flush(self):
+        """Write all buffered output with a single write call and flush the output stream."""
+        if not self._buffer:
+            return
+
+        output, self._buffer = "".join(self._buffer), []
+        target = self._stream or self._parent or _get_output()
+        target.write(output)
+        if not isinstance(target, Screen):
+            target.flush()
+
+
+class Canvas:
+    """Double buffered cell grid, which only renders the cells changed since the last rendered frame.
+    Each cell holds a character, a fore- and background color of Enum Colors and a set of Enum Styles.
+    Example:
+        canvas = Canvas(rows=10, cols=40)
+        canvas.put(1, 1, "CPU: 42%", forecolor=Colors.GREEN)
+        canvas.flush()  # Writes all cells on the first call, afterwards only the changed cells.
+    """
+
+    # Unchanged cells between two changed cells of a row are rewritten if there are not more than MAX_GAP
+    # of them, as rewriting a few cells needs less bytes than an escape sequence moving the cursor.
+    MAX_GAP = 4
+
+    def __init__(self, rows, cols, row=1, col=1):
+        """Initialize canvas with rows x cols blank cells, placed with its top-left cell at the terminal
+        position (row, col). Nothing is known about the terminal content, so the first frame is fully drawn."""
+        self._rows, self._cols, self._row, self._col = rows, cols, row, col
+        self._next = [[_BLANK] * cols for _ in range(rows)]
+        self._prev = [[None] * cols for _ in range(rows)]
+
+    @property
+    def size(self):
+        """Return tuple with number of rows and cols of the canvas."""
+        return (self._rows, self._cols)
+
+    def put(self, row, col, text, forecolor=Colors.RESET, backcolor=Colors.RESET, styles=None):
+        """Write text into the next frame starting at cell (row, col), with (1, 1) being the top-left cell.
+        Each character fills one cell of the row, text outside of the canvas is clipped. Colors must be of Enum
+        Colors, styles can be a single Enum cterm.Styles or a collection of Enum cterm.Styles."""
+        assert isinstance(forecolor, Colors), "Param 'forecolor' must be of Enum cterm.Colors."
+        assert isinstance(backcolor, Colors), "Param 'backcolor' must be of Enum cterm.Colors."
+        if not 1 <= row <= self._rows:
+            return
+
+        cells, attributes = self._next[row - 1], (forecolor, backcolor, _get_style_set(styles))
+        for idx, char in enumerate(str(text), col - 1):
+            if idx >= self._cols:
+                break
+            if idx >= 0:
+                cells[idx] = (char, *attributes)
+
+    def clear(self):
+        """Reset all cells of the next frame to blanks with default colors and styles."""
+        self._next = [[_BLANK] * self._cols for _ in range(self._rows)]
+
+    def invalidate(self):
+        """Forget the last rendered frame, so the next frame is fully drawn (e.g. after clearing the terminal)."""
+        self._prev = [[None] * self._cols for _ in range(self._rows)]
+
+    def render(self):
+        """Return string with the cursor moves, SGR sequences and text needed to turn the last rendered frame
+        into the next frame and remember the next frame as rendered. Colors and styles are reset at the end."""
+        output, state, cursor = [], TerminalState(), None
+        for row, (prevCells, nextCells) in enumerate(zip(self._prev, self._next)):
+            if prevCells == nextCells:
+                continue
+
+            for start, stop in self._get_changed_runs(prevCells, nextCells):
+                if cursor != (row, start):
+                    output.append(f"{_CSI}{self._row + row};{self._col + start}f")
+
+                for char, forecolor, backcolor, styles in nextCells[start:stop]:
+                    output.append(state.get_transition(forecolor, backcolor, styles))
+                    output.append(char)
+                cursor = (row, stop)
+
+        if output:
+            output.append(state.get_sequence(styles=Styles.RESET))
+
+        self._prev = [list(cells) for cells in self._next]
+        return "".join(output)
+
+    def flush(self):
+        """Write the changes of the next frame to the terminal (or the active Screen) with a single write.
+        Nothing is written if ANSI escape sequences are disabled, as the cells can't be positioned."""
+        output = self.render() if Terminal._ansi else ""
+        if output:
+            _write(output)
+            with _state_lock:
+                _state.invalidate()
+
+    def _get_changed_runs(self, prevCells, nextCells):
+        """Return list of (start, stop) col index tuples of the changed cells in a row, merging small gaps."""
+        runs = []
+        for idx in [idx for idx in range(self._cols) if prevCells[idx] != nextCells[idx]]:
+            if runs and idx - runs[-1][1] <= Canvas.MAX_GAP:
+                runs[-1][1] = idx + 1
+            else:
+                runs.append([idx, idx + 1])
+        return runs
+
+
+class Progress:
+    """Live progress display with one row per task (bar, counts, rate, ETA and status), which is redrawn in place
+    by a single renderer thread at a capped refresh rate. Tasks can be updated from any thread, as an update only
+    increments a counter and never writes to the terminal.
+    Example:
+        with Progress(refresh=10) as progress:
+            task = progress.add_task("Parsing", total=len(files))
+            for file in files:
+                task.advance()
+    """
+
+    class Task:
+        """Progress of a single task, which can be updated from any thread."""
+
+        def __init__(self, description, total=None):
+            """Initialize task with a description and the total number of items (None:=unknown)."""
+            self.description, self.total, self.status, self.completed = str(description), total, "", 0
+            self._start, self._lock = time.perf_counter(), threading.Lock()
+
+        def advance(self, count=1):
+            """Increment the number of completed items by count."""
+            with self._lock:
+                self.completed += count
+
+        def update(self, completed=None, total=None, status=None):
+            """Set the number of completed items, the total number of items or the status text if specified."""
+            with self._lock:
+                self.completed = self.completed if completed is None else completed
+                self.total = self.total if total is None else total
+                self.status = self.status if status is None else str(status)
+
+    def __init__(self, refresh=10, width=30, stream=None):
+        """Initialize progress display redrawn refresh times per second at most, with progress bars of width
+        characters. The output is written to the given text stream (default: output of the Terminal)."""
+        assert refresh > 0, "Param 'refresh' must be greater than zero."
+        self._interval, self._width, self._stream = 1 / refresh, width, stream
+        self._tasks, self._lock, self._rows, self._cols = [], threading.Lock(), 0, None
+        self._stopped, self._thread = threading.Event(), None
+
+    def __enter__(self):
+        """Start the renderer thread."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop the renderer thread and draw the final state of all tasks."""
+        self.stop()
+
+    def add_task(self, description, total=None):
+        """Add a new row to the display and return its Progress.Task used to update the progress."""
+        task = Progress.Task(description, total)
+        with self._lock:
+            self._tasks.append(task)
+        return task
+
+    def start(self):
+        """Hide the cursor and start the renderer thread redrawing the display at the capped refresh rate."""
+        # Module is only needed to fit the rows into the terminal width, so it's imported on first use.
+        import shutil
+
+        if self._thread is not None:
+            return
+
+        self._cols = shutil.get_terminal_size().columns - 1
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="cterm-progress", daemon=True)
+        if Terminal._ansi:
+            self._output(f"{_CSI}?25l")
+        self._thread.start()
+
+    def stop(self):
+        """Stop the renderer thread, draw the final state of all tasks and show the cursor again."""
+        if self._thread is None:
+            return
+
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+        self._redraw(final=True)
+
+    def render(self):
+        """Return list with the rows of all tasks (without escape sequences) at the current time."""
+        with self._lock:
+            tasks = list(self._tasks)
+
+        now, size = time.perf_counter(), max([len(task.description) for task in tasks], default=0)
+        rows = [self._format_task(task, now, size) for task in tasks]
+        return [row[: self._cols] for row in rows] if self._cols else rows
+
+    def _run(self):
+        """Redraw the display until the progress is stopped (executed by the renderer thread)."""
+        while not self._stopped.wait(self._interval):
+            self._redraw()
+
+    def _redraw(self, final=False):
+        """Move the cursor up to the first row of the last drawn frame and overwrite all rows with a single write.
+        Without ANSI escape sequences rows can't be overwritten, so only the final rows are written."""
+        rows = self.render()
+        if not Terminal._ansi:
+            if final:
+                self._output("".join([f"{row}\n" for row in rows]))
+            return
 
-        # Set font styles if specified.
-        if isinstance(styles, Styles):
-            Terminal.set_style(styles)
-        elif isinstance(styles, (list, tuple)):
-            Terminal.set_style(*styles)
+        frame = [f"{_CSI}{self._rows}A"] if self._rows else []
+        frame.extend([f"\r{_CSI}2K{row}\n" for row in rows])
+        frame.append(f"{_CSI}?25h" if final else "")
+        self._rows = len(rows)
+        self._output("".join(frame))
+
+    def _output(self, text):
+        """Write text to the output stream and flush it, so the frame is shown immediately."""
+        stream = self._stream or _get_output()
+        stream.write(text)
+        stream.flush()
+
+    def _format_task(self, task, now, size):
+        """Return row with description, progress bar, percentage, counts, rate, ETA and status of a task."""
+        completed, total, elapsed = task.completed, task.total, max(now - task._start, 1e-9)
+        rate = completed / elapsed
+        parts = [task.description.ljust(size)]
+        if total:
+            fraction = min(1.0, max(0.0, completed / total))
+            filled = int(fraction * self._width)
+            eta = (total - completed) / rate if rate > 0 else None
+            parts.append(f"[{'#' * filled}{'-' * (self._width - filled)}] {fraction:4.0%}")
+            parts.append(f"{completed}/{total}  {rate:.1f}/s  ETA {_format_duration(eta)}")
+        else:
+            parts.append(f"{completed}  {rate:.1f}/s  {_format_duration(elapsed)}")
+
+        if task.status:
+            parts.append(task.status)
+        return "  ".join(parts)
+
+
+class BackgroundWriter:
+    """Text stream passing written chunks via a bounded queue to a writer thread, which writes them to the output
+    stream. Each chunk composed by a Cursor or Terminal method is written as a whole, so output of several threads
+    doesn't interleave within escape sequences. If the queue is full, writes either block until there is space
+    (policy "block") or discard the oldest queued chunk (policy "drop"). Queued output is written at exit.
+    Example:
+        Terminal.set_output(BackgroundWriter(maxsize=1024, policy="drop"))
+    """
+
+    # Maximal number of queued chunks joined into a single write of the writer thread.
+    BATCH_SIZE = 256
+
+    def __init__(self, stream=None, maxsize=1024, policy="block"):
+        """Start writer thread writing to the given text stream (default: sys.stdout at the time of writing)."""
+        assert policy in ("block", "drop"), "Param 'policy' must be 'block' or 'drop'."
+        self._stream, self._policy, self._queue = stream, policy, queue.Queue(maxsize)
+        self._closed, self.dropped = False, 0
+
+        # The lock makes checking the closed flag and queueing a chunk atomic, so no chunk is queued after closing.
+        self._lock, self._stop = threading.Lock(), threading.Event()
+        self._thread = threading.Thread(target=self._run, name="cterm-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __enter__(self):
+        """Return the writer, which is closed when leaving the context."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Write all queued chunks and stop the writer thread."""
+        self.close()
+
+    @property
+    def closed(self):
+        """Return True if the writer was closed."""
+        return self._closed
+
+    def write(self, text):
+        """Queue text as a single chunk for the writer thread. After closing, text is written synchronously."""
+        if not text:
+            return 0
+
+        with self._lock:
+            if not self._closed:
+                if self._policy == "block":
+                    self._queue.put(text)
+                else:
+                    self._put_dropping(text)
+                return len(text)
+
+        self._get_stream().write(text)
+        return len(text)
+
+    def isatty(self):
+        """Return True if the output stream is a terminal."""
+        stream = self._get_stream()
+        return hasattr(stream, "isatty") and stream.isatty()
+
+    def flush(self):
+        """Return immediately, as the writer thread flushes the output stream after each write (see join)."""
+
+    def join(self):
+        """Block until all queued chunks are written to the output stream."""
+        self._queue.join()
+
+    def close(self):
+        """Write all queued chunks, stop the writer thread and flush the output stream."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        atexit.unregister(self.close)
+        self._stop.set()
+        try:
+            # Wake up the writer thread waiting for a chunk. A full queue needs no marker, as nothing waits.
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+        self._thread.join()
+
+        # The wake up marker may be left if the writer thread stopped before it was queued.
+        self._write_chunks(self._get_chunks(block=False))
+
+    def _run(self):
+        """Write queued chunks in batches until the writer is closed and the queue is empty (executed by writer
+        thread). No chunks are queued after closing, so the queue is empty once all remaining chunks are written."""
+        while True:
+            try:
+                self._write_chunks(self._get_chunks(block=True))
+            except Exception:
+                # Unexpected errors (e.g. chunks or streams of wrong type) discard the batch, but must not stop
+                # the writer thread, as join() and producers waiting for free space would block forever.
+                pass
+            if self._stop.is_set() and self._queue.empty():
+                return
+
+    def _get_chunks(self, block):
+        """Return list with up to BATCH_SIZE queued chunks, waiting for the first chunk if block is True."""
+        chunks = [self._queue.get()] if block else []
+        while len(chunks) < BackgroundWriter.BATCH_SIZE:
+            try:
+                chunks.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return chunks
+
+    def _write_chunks(self, chunks):
+        """Write all chunks with a single write, flush the output stream and mark the chunks as done. Output errors
+        discard the chunks, as there is no caller to report them to (e.g. terminal or SSH session closed)."""
+        try:
+            text = "".join([chunk for chunk in chunks if chunk is not None])
+            if text:
+                stream = self._get_stream()
+                stream.write(text)
+                stream.flush()
+        except (OSError, ValueError):
+            pass
+        finally:
+            for _ in chunks:
+                self._queue.task_done()
+
+    def _put_dropping(self, text):
+        """Queue text without blocking by discarding the oldest queued chunks while the queue is full."""
+        while True:
+            try:
+                self._queue.put_nowait(text)
+                return
+            except queue.Full:
+                pass
+
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+                self.dropped += 1
+            except queue.Empty:
+                pass
+
+    def _get_stream(self):
+        """Return output stream of the writer (resolved at call time, as sys.stdout may be replaced)."""
+        return self._stream or sys.stdout
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# FUNCTIONS BELOW SHOULD BE TREATED AS PRIVATE FUNCTIONS (IMPLEMENTATION DETAILS)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+def _get_screen_stack():
+    """Return stack of Screen buffers activated by the calling thread."""
+    if not hasattr(_screens, "stack"):
+        _screens.stack = []
+    return _screens.stack
+
+
+def _write(text):
+    """Write text to the innermost Screen buffer activated by the calling thread or to the Terminal output."""
+    stack = getattr(_screens, "stack", None)
+    if stack:
+        stack[-1].write(text)
+    else:
+        (Terminal._output or sys.stdout).write(text)
+
+
+def _get_ansi_support(stream):
+    """Return True if the stream is a terminal and the NO_COLOR environment variable is not set or empty."""
+    if os.environ.get("NO_COLOR"):
+        return False
+
+    isatty = getattr(stream, "isatty", None)
+    try:
+        return bool(isatty and isatty())
+    except (OSError, ValueError):
+        return False
+
+
+def _get_output():
+    """Return text stream set via Terminal.set_output or sys.stdout (resolved at call time, as it may be replaced)."""
+    return Terminal._output or sys.stdout
+
+
+def _get_state():
+    """Return tuple (state, lock) with the module terminal state and the lock guarding it if state tracking is
+    enabled, else a new unknown state only used by the calling thread and a lock doing nothing."""
+    if Terminal._tracking:
+        return _state, _state_lock
+    return TerminalState(), nullcontext()
+
+
+@functools.lru_cache(maxsize=512)
+def _get_sgr_sequence(codes):
+    """Return cached SGR escape sequence for the given tuple of SGR code strings."""
+    return f"{_CSI}{';'.join(codes)}m"
+
+
+def _get_style_set(styles):
+    """Return frozenset of the given Enum Styles (a single style, a collection or None) without Styles.RESET."""
+    if styles is None:
+        return frozenset()
+
+    styles = (styles,) if isinstance(styles, Styles) else tuple(styles)
+    for style in styles:
+        assert isinstance(style, Styles), "Param(s) 'styles' must be of Enum cterm.Styles."
+    return frozenset(style for style in styles if style is not Styles.RESET)
+
+
+def _format_duration(seconds):
+    """Return duration in seconds formatted as H:MM:SS (None:=unknown)."""
+    if seconds is None:
+        return "-:--:--"
+
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+# Terminal state tracked for the Cursor and Terminal methods (see Terminal.track_state).
+_state = TerminalState()
 
-        # Write text to terminal using optional position, colors and styles.
-        print(text, end="")
+# Lock composing and writing the escape sequences of the tracked state, which is shared by all threads.
+_state_lock = threading.RLock()
 
-        # Reset colors, styles and cursor position if auto_reset is set.
-        if auto_reset:
-            Terminal.set_color(forecolor=Colors.RESET, backcolor=Colors.RESET)
-            Terminal.set_style(Styles.RESET)
-            Cursor.restore_pos()
+# Detect if ANSI escape sequences are supported by the default output.
+Terminal.set_output()
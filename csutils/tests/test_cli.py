@@ -0,0 +1,73 @@
+"""
+#######################################################################################
+# Module: test_cli.py
+# This module contains the unit tests for the csutils command line interface.
+#
+# @package: csutils.cli
+# @author:  cwsoft
+# @python:  3.8 or higher
+#######################################################################################
+"""
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+from pathlib import Path
+
+# Monkey patch system path so we can access the csutils package without installing it.
+sys.path.append(os.path.abspath(r"../../"))
+from csutils.cli import main
+
+# Global values
+INPUT_FILE = str(Path(r"./data/test.dat").resolve())
+
+
+def run(*argv, stderr=None):
+    """Return tuple with exit code and stdout output of the command line interface."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(stderr or io.StringIO()):
+        code = main(list(argv))
+    return code, output.getvalue()
+
+
+class CliTest(unittest.TestCase):
+    def test_grep(self):
+        """Test subcommand grep with subpatterns, row indices and filenames."""
+        result = "4:FREQUENCY = 60 Hz\n5:FrEqUeNcY = 70 Hz\n6:frequency = 80 Hz\n"
+        self.assertEqual(run("grep", "rx:Freq", INPUT_FILE, "-n", "--sub=-1:rx:[0-9]{2}"), (0, result))
+
+        result = f"{INPUT_FILE}:FrEqUeNcY = 70 Hz\n" * 2
+        self.assertEqual(run("grep", "FrEq", INPUT_FILE, INPUT_FILE, "-s", "-j", "2"), (0, result))
+        self.assertEqual(run("grep", "NOT_CONTAINED", INPUT_FILE), (1, ""))
+
+    def test_errors(self):
+        """Test error messages and exit code 2 for invalid regex patterns and missing inputs."""
+        stderr = io.StringIO()
+        self.assertEqual(run("grep", "rx:(", INPUT_FILE, stderr=stderr), (2, ""))
+        self.assertTrue(stderr.getvalue().startswith("csutils: missing ), unterminated subpattern"))
+
+        stderr = io.StringIO()
+        result = "FrEqUeNcY = 70 Hz\n"
+        argv = ("grep", "FrEq", INPUT_FILE, "missing.dat", "-s", "--no-filename")
+        self.assertEqual(run(*argv, stderr=stderr), (2, result))
+        self.assertEqual(stderr.getvalue(), "csutils: missing.dat: no such file or no files matching the pattern\n")
+
+        # Row and column indices out of range are reported as errors, also if processed in parallel.
+        for argv in (("lines", "100", INPUT_FILE), ("values", "3", INPUT_FILE, INPUT_FILE, "--cols", "9", "-j", "2")):
+            stderr = io.StringIO()
+            self.assertEqual(run(*argv, stderr=stderr), (2, ""))
+            self.assertEqual(stderr.getvalue(), "csutils: list index out of range\n")
+
+    def test_lines_values_block(self):
+        """Test subcommands lines, values and block."""
+        self.assertEqual(run("lines", "9:11", INPUT_FILE), (0, "1  2  3  4\n5  6  7  8\n"))
+        self.assertEqual(run("values", "3:5", INPUT_FILE, "--cols", "2,3"), (0, "50 Hz\n60 Hz\n"))
+
+        result = "14:A 3x3 Matrix as Fortran fixed format\n15:123\n16:456\n17:789\n18:\n"
+        self.assertEqual(run("block", "fortran", "rx:^\\s*$", INPUT_FILE, "-n"), (0, result))
+
+
+if __name__ == "__main__":
+    unittest.main()
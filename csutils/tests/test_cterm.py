@@ -9,13 +9,264 @@
 #######################################################################################
 """
 
+import io
 import os
 import sys
+import threading
+import time
+import unittest
 
 # Monkey patch system path so we can access the csutils package without installing it.
 sys.path.append(os.path.abspath(r"../../"))
-from csutils.cterm import Colors, Cursor, Styles, Terminal
+from csutils.cterm import BackgroundWriter, Canvas, Colors, Cursor, Progress, Screen, Styles, Terminal, TerminalState
 
+# Global values
+CSI = "\033["
+
+
+class CtermTest(unittest.TestCase):
+    def setUp(self):
+        """Enable ANSI escape sequences, which are disabled by default as the test output is no terminal."""
+        Terminal.set_output(ansi=True)
+
+    def tearDown(self):
+        """Reset output to sys.stdout with automatic detection of ANSI support."""
+        Terminal.set_output()
+
+    def test_screen(self):
+        """Test class Screen collecting output of Cursor and Terminal methods into a single write."""
+        stream = io.StringIO()
+        with Screen(stream=stream) as screen:
+            Cursor.set_pos(row=2, col=3)
+            Terminal.write("Hi", forecolor=Colors.RED, styles=Styles.BOLD, auto_reset=True)
+            self.assertEqual(stream.getvalue(), "")
+
+            # Output of nested screens is written to the enclosing screen.
+            with Screen():
+                Cursor.up(2)
+            self.assertTrue(screen.getvalue().endswith(f"{CSI}2A"))
+
+        result = f"{CSI}2;3f{CSI}s{CSI}31;1mHi{CSI}0m{CSI}u{CSI}2A"
+        self.assertEqual(stream.getvalue(), result)
+
+    def test_terminal_state(self):
+        """Test merged SGR sequences and skipped redundant changes of class TerminalState and Terminal."""
+        state = TerminalState()
+        self.assertEqual(state.get_sequence(Colors.RED, styles=Styles.BOLD), f"{CSI}31;1m")
+        self.assertEqual(state.get_sequence(Colors.RED, styles=Styles.BOLD), f"{CSI}1m")  # Other styles unknown.
+
+        # After a reset all attributes are known, so only codes changing the state are emitted.
+        state.get_sequence(styles=Styles.RESET)
+        styles = (Styles.UNDERLINE, Styles.BOLD)
+        self.assertEqual(state.get_sequence(Colors.RED, Colors.GREY, styles), f"{CSI}31;100;1;4m")
+        self.assertEqual(state.get_sequence(Colors.RED, styles=Styles.BOLD), "")
+        self.assertEqual(state.get_sequence(Colors.GREEN, styles=Styles.REVERSE), f"{CSI}32;7m")
+        self.assertEqual(state.get_sequence(styles=Styles.RESET), f"{CSI}0m")
+        self.assertEqual(state.get_sequence(Colors.RESET, Colors.RESET, Styles.RESET), "")
+        self.assertEqual(state.get_transition(Colors.BLUE, Colors.RESET, frozenset({Styles.BOLD})), f"{CSI}34;1m")
+        self.assertEqual(state.get_transition(Colors.BLUE, Colors.RESET, frozenset()), f"{CSI}0;34m")
+
+        # Attributes before a trailing RESET are discarded, as the terminal applies the codes in the given order.
+        state = TerminalState()
+        styles = [Styles.UNDERLINE, Styles.RESET, Styles.BOLD]
+        self.assertEqual(state.get_sequence(Colors.RED, styles=styles), f"{CSI}0;1m")
+        stream = io.StringIO()
+        with Screen(stream=stream):
+            Terminal.set_style(Styles.BOLD, Styles.RESET)
+            Terminal.write("Hi", styles=[Styles.UNDERLINE, Styles.RESET])
+        self.assertEqual(stream.getvalue(), f"{CSI}0m{CSI}0mHi")
+
+        # Redundant changes are only skipped by the Terminal methods if state tracking is enabled.
+        for tracking, result in ((False, f"{CSI}31m{CSI}31m{CSI}31;1m"), (True, f"{CSI}31m{CSI}1m")):
+            stream = io.StringIO()
+            try:
+                Terminal.track_state(tracking)
+                with Screen(stream=stream):
+                    Terminal.set_color(forecolor=Colors.RED)
+                    Terminal.set_color(forecolor=Colors.RED)
+                    Terminal.write("", forecolor=Colors.RED, styles=[Styles.BOLD])
+            finally:
+                Terminal.track_state(False)
+            self.assertEqual(stream.getvalue(), result)
+
+    def test_terminal_threads(self):
+        """Test Terminal.write called by several threads always composing complete escape sequences."""
+        writes = []
+        stream = io.StringIO()
+        stream.write = writes.append
+        Terminal.set_output(stream, ansi=True)
+
+        def write_colored(color):
+            for _ in range(2000):
+                Terminal.write("Hi", forecolor=color, styles=Styles.BOLD, auto_reset=True)
+
+        # A short switch interval lets the threads interleave within the Terminal.write calls.
+        interval = sys.getswitchinterval()
+        for tracking in (False, True):
+            writes.clear()
+            try:
+                sys.setswitchinterval(1e-6)
+                Terminal.track_state(tracking)
+                threads = [threading.Thread(target=write_colored, args=(color,)) for color in (Colors.RED, Colors.BLUE)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            finally:
+                sys.setswitchinterval(interval)
+                Terminal.track_state(False)
+            self.assertEqual(len(writes), 4000)
+            self.assertTrue(all([output.endswith(f"Hi{CSI}0m{CSI}u") for output in writes]))
+
+    def test_canvas(self):
+        """Test class Canvas rendering only the cells changed since the last rendered frame."""
+        canvas = Canvas(rows=2, cols=4, row=3, col=5)
+        canvas.put(1, 1, "Hi", forecolor=Colors.GREEN)
+        canvas.put(2, 3, "abcdef", styles=Styles.BOLD)
+        result = f"{CSI}3;5f{CSI}0;32mHi{CSI}39m  {CSI}4;5f  {CSI}1mab{CSI}0m"
+        self.assertEqual(canvas.render(), result)
+        self.assertEqual(canvas.render(), "")
+
+        # Only the changed cell is written, removing a style resets all attributes.
+        canvas.put(2, 4, "X")
+        self.assertEqual(canvas.render(), f"{CSI}4;8f{CSI}0mX")
+
+        # Changed cells separated by small gaps are written as a single run.
+        canvas.put(1, 1, "Ho", forecolor=Colors.GREEN)
+        canvas.put(1, 4, "!", forecolor=Colors.GREEN)
+        self.assertEqual(canvas.render(), f"{CSI}3;6f{CSI}0;32mo{CSI}39m {CSI}32m!{CSI}0m")
+
+        # Flush writes the changes with a single write to the active screen.
+        stream = io.StringIO()
+        canvas.invalidate()
+        with Screen(stream=stream):
+            canvas.flush()
+        self.assertTrue(stream.getvalue().startswith(f"{CSI}3;5f{CSI}0;32mHo"))
+
+    def test_progress(self):
+        """Test class Progress redrawing the rows of all tasks in place from a single renderer thread."""
+        stream = io.StringIO()
+        with Progress(refresh=100, width=10, stream=stream) as progress:
+            task = progress.add_task("Files", total=8)
+            lines = progress.add_task("Lines")
+            workers = [threading.Thread(target=lambda: [task.advance() for _ in range(2)]) for _ in range(2)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+            lines.update(completed=1200, status="parsing")
+            rows = progress.render()
+            self.assertTrue(rows[0].startswith("Files  [#####-----]  50%  4/8  "))
+            self.assertTrue(rows[1].startswith("Lines  1200  ") and rows[1].endswith("  parsing"))
+            time.sleep(0.05)
+
+        # Frames after the first one move the cursor up to overwrite the rows of the last frame.
+        output = stream.getvalue()
+        self.assertTrue(output.startswith(f"{CSI}?25l\r{CSI}2KFiles  "))
+        self.assertIn(f"{CSI}2A\r{CSI}2KFiles  ", output)
+        self.assertTrue(output.endswith(f"{CSI}?25h"))
+
+    def test_background_writer(self):
+        """Test class BackgroundWriter writing whole chunks of the Terminal output from its writer thread."""
+        stream = io.StringIO()
+        try:
+            with BackgroundWriter(stream=stream, maxsize=4) as writer:
+                Terminal.set_output(writer, ansi=True)
+                workers = [threading.Thread(target=Cursor.set_pos, args=(row, 1)) for row in range(1, 21)]
+                for worker in workers:
+                    worker.start()
+                for worker in workers:
+                    worker.join()
+                Terminal.write("Done", forecolor=Colors.GREEN)
+        finally:
+            Terminal.set_output(ansi=True)
+
+        output = stream.getvalue()
+        self.assertTrue(output.endswith(f"{CSI}32mDone"))
+        self.assertEqual(sorted(output[:-9].split(CSI)[1:]), sorted(f"{row};1f" for row in range(1, 21)))
+
+        # Policy "drop" discards the oldest chunks instead of blocking while the output stream is stalled.
+        class StalledStream(io.StringIO):
+            def write(self, text):
+                resume.wait()
+                return super().write(text)
+
+        resume, stream = threading.Event(), StalledStream()
+        with BackgroundWriter(stream=stream, maxsize=2, policy="drop") as writer:
+            for idx in range(10):
+                writer.write(f"{idx};")
+            self.assertGreater(writer.dropped, 0)
+            resume.set()
+        self.assertTrue(stream.getvalue().endswith("8;9;"))
+        self.assertLess(len(stream.getvalue()), 20)
+
+        # Chunks raising unexpected errors are discarded without stopping the writer thread.
+        stream = io.StringIO()
+        with BackgroundWriter(stream=stream) as writer:
+            writer.write(b"bytes")
+            writer.write("text")
+            joiner = threading.Thread(target=writer.join, daemon=True)
+            joiner.start()
+            joiner.join(timeout=5)
+            self.assertFalse(joiner.is_alive())
+            writer.write("done")
+        self.assertTrue(stream.getvalue().endswith("done"))
+
+        # Closing while other threads keep writing neither hangs nor loses chunks written before or after closing.
+        class SlowStream(io.StringIO):
+            def write(self, text):
+                time.sleep(0.001)
+                return super().write(text)
+
+        interval = sys.getswitchinterval()
+        try:
+            sys.setswitchinterval(1e-6)
+            for policy in ("block", "drop") * 5:
+                stream = SlowStream()
+                writer = BackgroundWriter(stream=stream, maxsize=2, policy=policy)
+                workers = [threading.Thread(target=lambda: [writer.write("x") for _ in range(100)]) for _ in range(4)]
+                for worker in workers:
+                    worker.start()
+                time.sleep(0.005)
+                closer = threading.Thread(target=writer.close, daemon=True)
+                closer.start()
+                closer.join(timeout=5)
+                self.assertFalse(closer.is_alive())
+                for worker in workers:
+                    worker.join()
+                self.assertEqual(len(stream.getvalue()) + writer.dropped, 400)
+        finally:
+            sys.setswitchinterval(interval)
+
+    def test_output(self):
+        """Test Terminal.set_output skipping all escape sequences if the output is no terminal or NO_COLOR is set."""
+        stream = io.StringIO()
+        Terminal.set_output(stream)
+        Cursor.set_pos(row=2, col=3)
+        Terminal.set_color(forecolor=Colors.RED)
+        Terminal.write("Plain text", row=1, col=1, styles=Styles.BOLD, auto_reset=True)
+        self.assertEqual(stream.getvalue(), "Plain text")
+
+        # Terminal output is detected via isatty, unless the NO_COLOR environment variable is set.
+        stream.isatty = lambda: True
+        environ = os.environ.pop("NO_COLOR", None)
+        try:
+            Terminal.set_output(stream)
+            Terminal.set_style(Styles.BOLD)
+            self.assertEqual(stream.getvalue(), f"Plain text{CSI}1m")
+
+            os.environ["NO_COLOR"] = "1"
+            Terminal.set_output(stream)
+            Terminal.set_style(Styles.BOLD)
+            self.assertEqual(stream.getvalue(), f"Plain text{CSI}1m")
+        finally:
+            os.environ.pop("NO_COLOR", None)
+            if environ is not None:
+                os.environ["NO_COLOR"] = environ
+
+
+# Unit tests run via 'python -m pytest', the interactive demo below via 'python test_cterm.py'.
 if __name__ == "__main__":
     try:
         # Initialize terminal (clear screen, set cursor position to row=1, col=1.)
@@ -8,7 +8,13 @@
 # @python:  3.8 or higher
 #######################################################################################
 """
+import asyncio
+import importlib
+import io
+import os
+import subprocess
 import sys
+import time
 import unittest
 
 from pathlib import Path
@@ -54,6 +60,210 @@ class TextparserTest(unittest.TestCase):
 
         self.assertEqual(_tp._lines, result)
 
+    def test_explicit_constructors(self):
+        """Test class methods from_file, from_string and from_stream."""
+        _tp = Textparser.from_file(INPUT_FILE)
+        self.assertEqual((_tp.source, _tp._lines), (tp.source, tp._lines))
+
+        # Strings are never treated as file paths by from_string.
+        _tp = Textparser.from_string(str(INPUT_FILE))
+        self.assertEqual((_tp.source, _tp.lines), ("String", 1))
+
+        # Streams are read in chunks, lines may span multiple chunks.
+        data = INPUT_FILE.read_text()
+        _tp = Textparser.from_stream(io.StringIO(data), chunkSize=7)
+        self.assertEqual((_tp.source, _tp._lines), ("Stream", tp._lines))
+
+        _tp = Textparser.from_stream(io.BytesIO("Gr\u00fc\u00dfe\nline 2".encode("utf-8")), chunkSize=3)
+        self.assertEqual(_tp._lines, ["Gr\u00fc\u00dfe\n", "line 2"])
+
+        _tp = Textparser.from_stream(io.StringIO(data), mode="bytes", chunkSize=5)
+        self.assertEqual(_tp._lines, INPUT_FILE.read_bytes().splitlines(keepends=True))
+
+    def test_shared_memory(self):
+        """Test methods share, attach and close_shared."""
+        for mode in ("text", "bytes"):
+            _tp = Textparser(source=INPUT_FILE, mode=mode)
+            name = _tp.share()
+            self.assertEqual(_tp.share(), name)
+
+            with Textparser.attach(name) as shared:
+                self.assertEqual((shared.source, shared.lines, shared.mode), (tp.source, tp.lines, mode))
+                self.assertEqual(shared.get_lines(), tp.get_lines())
+                self.assertEqual(shared.get_values(rows="15:18", cols="0:1,1:2,2:3"), "1 2 3\n4 5 6\n7 8 9\n")
+                self.assertEqual(
+                    shared.get_matches(pattern="rx:Freq", subpatterns=(-1, "rx:[0-9]{2}")),
+                    tp.get_matches(pattern="rx:Freq", subpatterns=(-1, "rx:[0-9]{2}")),
+                )
+            self.assertEqual(shared.lines, 0)
+
+            _tp.close_shared()
+            self.assertRaises(FileNotFoundError, Textparser.attach, name)
+
+    def test_package_attributes(self):
+        """Test lazily imported public names and submodules of the csutils package in a fresh interpreter."""
+        code = "import csutils; assert csutils.textparser.Textparser is csutils.Textparser; csutils.cterm.Colors"
+        env = dict(os.environ, PYTHONPATH=str(Path(r"../../").resolve()))
+        subprocess.run([sys.executable, "-c", code], env=env, check=True)
+
+    def test_shared_memory_other_process(self):
+        """Test that an independent process attaching to a shared block doesn't destroy it on exit."""
+        _tp = Textparser(source=INPUT_FILE)
+        name = _tp.share()
+        try:
+            code = f"from csutils.textparser import Textparser; Textparser.attach({name!r}).close_shared()"
+            env = dict(os.environ, PYTHONPATH=str(Path(r"../../").resolve()))
+            subprocess.run([sys.executable, "-c", code], env=env, check=True)
+
+            # Resource trackers of older Python versions clean up shortly after the process has exited.
+            time.sleep(0.5)
+
+            with Textparser.attach(name) as shared:
+                self.assertEqual(shared.get_lines(), tp.get_lines())
+        finally:
+            _tp.close_shared()
+        self.assertRaises(FileNotFoundError, Textparser.attach, name)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires the fork start method")
+    def test_shared_memory_forked_processes(self):
+        """Test attaching to a shared block from the owner process and forked pool workers without tracker errors."""
+        code = "\n".join(
+            [
+                "import multiprocessing",
+                "from csutils.textparser import Textparser",
+                "def work(name):",
+                "    with Textparser.attach(name) as shared:",
+                "        return shared.lines",
+                "if __name__ == '__main__':",
+                f"    tp = Textparser({str(INPUT_FILE)!r})",
+                "    name = tp.share()",
+                "    with Textparser.attach(name) as shared:",
+                "        assert shared.lines == tp.lines",
+                "    with multiprocessing.get_context('fork').Pool(2) as pool:",
+                "        assert pool.map(work, [name] * 4) == [tp.lines] * 4",
+                "    tp.close_shared()",
+            ]
+        )
+        env = dict(os.environ, PYTHONPATH=str(Path(r"../../").resolve()))
+        result = subprocess.run([sys.executable, "-c", code], env=env, stderr=subprocess.PIPE, check=True)
+        self.assertEqual(result.stderr, b"")
+
+    def test_compressed_sources(self):
+        """Test methods from_source and iter_lines with gzip, bz2 and xz compressed textfiles."""
+        data = INPUT_FILE.read_bytes()
+        for codec, outfile in [("gzip", "./tmp.gz"), ("bz2", "./tmp.bz2"), ("lzma", "./tmp.xz"), ("gzip", "./tmp.out")]:
+            # Compressed files without known file extension are detected by their magic bytes.
+            Path(outfile).write_bytes(importlib.import_module(codec).compress(data))
+            _tp = Textparser(source=outfile)
+            lines = list(Textparser.iter_lines(outfile))
+            Path(outfile).unlink()
+
+            self.assertEqual(_tp._lines, tp._lines)
+            self.assertEqual(lines, tp._lines)
+
+    def test_bytes_mode(self):
+        """Test bytes mode with lazy decoding and explicit encoding control."""
+        _tp = Textparser(source=INPUT_FILE, mode="bytes")
+        self.assertEqual(_tp.mode, "bytes")
+        self.assertIsInstance(_tp._lines[0], bytes)
+        self.assertEqual(_tp.get_lines(rows="9:13"), tp.get_lines(rows="9:13"))
+        self.assertEqual(_tp.get_values(rows="3:7", cols="2, 3"), tp.get_values(rows="3:7", cols="2, 3"))
+        self.assertEqual(_tp.get_matches(pattern="FrEq", ignoreCase=False), [(5, "FrEqUeNcY = 70 Hz\n")])
+        self.assertEqual(
+            _tp.get_matches(pattern="rx:Freq", subpatterns=(-1, "rx:[0-9]{2}")),
+            tp.get_matches(pattern="rx:Freq", subpatterns=(-1, "rx:[0-9]{2}")),
+        )
+
+        # Non UTF-8 bytes are only decoded for returned lines using the specified encoding and errors.
+        Path("./tmp.out").write_bytes(b"Temperature = 20 \xb0C\nPressure = 1 bar\n")
+        _tp = Textparser(source="./tmp.out", mode="bytes", encoding="latin-1")
+        self.assertEqual(_tp.get_match(pattern="temp"), (0, "Temperature = 20 \xb0C\n"))
+        _tp = Textparser(source="./tmp.out", mode="bytes", errors="replace")
+        self.assertEqual(_tp.get_values(rows=0, cols=3), "\ufffdC")
+        self.assertEqual(_tp.get_match(pattern="rx:\\d+ bar"), (1, "Pressure = 1 bar\n"))
+        _tp = Textparser(source="./tmp.out", encoding="latin-1")
+        self.assertEqual(_tp.get_lines(rows=0), "Temperature = 20 \xb0C\n")
+        Path("./tmp.out").unlink()
+
+    def test_text_writer(self):
+        """Test buffered TextWriter returned by method open_writer."""
+        with Textparser.open_writer(r"./tmp.out", append=False, bufferSize=10) as writer:
+            writer.write("This is line 1.\n")
+            writer.write(f"This is line {idx}.\n" for idx in range(2, 5))
+        self.assertTrue(writer.closed)
+        self.assertEqual(Textparser(r"./tmp.out").lines, 4)
+
+        # Atomic output replaces the target file on close and is discarded on errors.
+        with self.assertRaises(RuntimeError):
+            with Textparser.open_writer(r"./tmp.out", atomic=True) as writer:
+                writer.write(["This is line 5.\n"])
+                raise RuntimeError("Abort")
+        self.assertEqual(Textparser(r"./tmp.out").lines, 4)
+
+        with Textparser.open_writer(r"./tmp.out", atomic=True) as writer:
+            writer.write(["This is line 5.\n"])
+        self.assertEqual(Textparser(r"./tmp.out").get_lines(rows=4), "This is line 5.\n")
+        self.assertEqual(list(Path(".").glob(".tmp.out.*")), [])
+
+        # Atomic output keeps the mode of the target file, new files get the default mode of the process.
+        if os.name == "posix":
+            os.chmod(r"./tmp.out", 0o640)
+            with Textparser.open_writer(r"./tmp.out", atomic=True) as writer:
+                writer.write(["This is line 6.\n"])
+            self.assertEqual(Path(r"./tmp.out").stat().st_mode & 0o777, 0o640)
+
+            umask = os.umask(0o022)
+            try:
+                with Textparser.open_writer(r"./tmp_new.out", atomic=True) as writer:
+                    writer.write(["This is line 1.\n"])
+            finally:
+                os.umask(umask)
+            self.assertEqual(Path(r"./tmp_new.out").stat().st_mode & 0o777, 0o644)
+            Path(r"./tmp_new.out").unlink()
+
+        # Temporary files are removed if the output can't be opened.
+        with self.assertRaises(LookupError):
+            Textparser.open_writer(r"./tmp.out", atomic=True, encoding="no-such-codec")
+        self.assertEqual(list(Path(".").glob(".tmp.out.*")), [])
+        Path(r"./tmp.out").unlink()
+
+        # Compressed output is detected from the file extension.
+        with Textparser.open_writer(r"./tmp.gz", append=False) as writer:
+            writer.write(tp._lines)
+        self.assertEqual(Path(r"./tmp.gz").read_bytes()[:2], b"\x1f\x8b")
+        self.assertEqual(Textparser(r"./tmp.gz")._lines, tp._lines)
+        Path(r"./tmp.gz").unlink()
+
+    def test_stats(self):
+        """Test opt-in instrumentation via enable_stats, stats, global_stats and stats hooks."""
+        events = []
+
+        def hook(textparser, operation, counters):
+            events.append((operation, counters[f"{operation}_calls"]))
+
+        Textparser.reset_stats()
+        Textparser.add_stats_hook(hook)
+        Textparser.enable_stats()
+        try:
+            _tp = Textparser(source=INPUT_FILE)
+            _tp.get_matches(pattern="rx:Freq", subpatterns=(-1, "rx:[0-9]{2}"))
+            _tp.get_values(rows="3:7", cols="2, 3")
+        finally:
+            Textparser.enable_stats(False)
+            Textparser.remove_stats_hook(hook)
+
+        stats = _tp.stats
+        self.assertEqual(stats["load_bytes"], INPUT_FILE.stat().st_size)
+        self.assertEqual((stats["lines_loaded"], stats["lines_scanned"], stats["regex_evaluations"]), (20, 20, 20))
+        self.assertEqual((stats["subpattern_checks"], stats["matches"]), (4, 3))
+        self.assertEqual(stats["output_bytes"], len("50 Hz\n60 Hz\n70 Hz\n80 Hz\n"))
+        self.assertEqual(events, [("load", 1), ("match", 1), ("get_values", 1)])
+        self.assertEqual(Textparser.global_stats()["match_calls"], 1)
+
+        # No stats are collected while instrumentation is disabled.
+        _tp.get_lines()
+        self.assertNotIn("get_lines_calls", _tp.stats)
+
     def test_get_numbered_source_lines(self):
         """Test method get_numbered_source_lines"""
         data = "This is line 1.\nThis is line 2.\nThis is line 3.\nThis is line 4.\n"
@@ -285,6 +495,29 @@ class TextparserTest(unittest.TestCase):
         matches = tp.get_matches(pattern="rx:Freq", subpatterns=(-999, "rx:[0-9]{2}"))
         self.assertEqual(matches, [(None, None)])
 
+    def test_async_api(self):
+        """Test methods aopen, aopen_all, aget_match, aget_matches and aiter_matches."""
+
+        async def run():
+            _tp = await Textparser.aopen(source=INPUT_FILE)
+            _tps = await Textparser.aopen_all([INPUT_FILE, "Freq 1\nfreq 2\n"], limit=1)
+            return (
+                _tp.lines,
+                [_tp.lines for _tp in _tps],
+                await _tp.aget_match(pattern="FrEq", ignoreCase=False),
+                await _tp.aget_matches(pattern="rx:Freq", subpatterns=(-1, "rx:[0-9]{2}"), chunkSize=2),
+                await _tp.aget_matches(pattern="NOT_CONTAINED"),
+                [match async for match in _tps[1].aiter_matches(pattern="freq", chunkSize=1)],
+            )
+
+        lines, nbrLines, match, matches, nomatch, streamed = asyncio.run(run())
+        self.assertEqual(lines, 20)
+        self.assertEqual(nbrLines, [20, 2])
+        self.assertEqual(match, tp.get_match(pattern="FrEq", ignoreCase=False))
+        self.assertEqual(matches, tp.get_matches(pattern="rx:Freq", subpatterns=(-1, "rx:[0-9]{2}")))
+        self.assertEqual(nomatch, [(None, None)])
+        self.assertEqual(streamed, [(0, "Freq 1\n"), (1, "freq 2\n")])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,82 @@
+"""
+#######################################################################################
+# Module: test_textrender.py
+# This module contains the unit tests for the textrender module.
+#
+# @package: csutils.textrender
+# @author:  cwsoft
+# @python:  3.8 or higher
+#######################################################################################
+"""
+import io
+import os
+import sys
+import unittest
+
+from pathlib import Path
+
+# Monkey patch system path so we can access the csutils package without installing it.
+sys.path.append(os.path.abspath(r"../../"))
+from csutils.cterm import Terminal
+from csutils.textparser import Textparser
+from csutils.textrender import TextRenderer
+
+# Global values
+INPUT_FILE = Path(r"./data/test.dat").resolve()
+CSI = "\033["
+
+
+class TextRendererTest(unittest.TestCase):
+    def setUp(self):
+        self.tp = Textparser(INPUT_FILE)
+
+    def test_render_matches(self):
+        """Test rendering of match results with highlighted hits, row indices and name prefix."""
+        matches = self.tp.get_matches("rx:Freq\\w+")
+        renderer = TextRenderer(color=False, lineNumbers=True, name="test")
+        self.assertTrue(renderer.render_matches(matches).startswith("test:3:Frequency = 50 Hz\ntest:4:"))
+        self.assertEqual(renderer.render_matches(self.tp.get_matches("NOT_CONTAINED")), "")
+
+        renderer = TextRenderer(color=True, lineNumbers=True)
+        result = f"{CSI}32m3{CSI}0m:{CSI}31;1mFreq{CSI}0muency = 50 Hz\n"
+        self.assertEqual(renderer.render_matches(self.tp.get_match("freq"), "freq"), result)
+
+        # Empty hits of regex patterns are not highlighted.
+        self.assertEqual(TextRenderer().render_matches((1, "abc\n"), "rx:x*"), "abc\n")
+
+        # Chunks joined together equal the rendered string, output is written with buffered writes.
+        chunks = list(renderer.iter_matches(matches, "rx:Freq\\w+", chunkSize=40))
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual("".join(chunks), renderer.render_matches(matches, "rx:Freq\\w+"))
+
+        stream = io.StringIO()
+        renderer.write(iter(chunks), stream=stream)
+        self.assertEqual(stream.getvalue(), "".join(chunks))
+
+    def test_render_lines_and_table(self):
+        """Test rendering of numbered lines and column values as table with aligned columns."""
+        renderer = TextRenderer(color=False)
+        result = " 8:A 4x4 Matrix:\n 9:1  2  3  4\n10:5  6  7  8\n"
+        self.assertEqual(renderer.render_lines(self.tp.get_lines("8:11"), start=8), result)
+        self.assertEqual(renderer.render_lines(["a\n", "b"], start=9), " 9:a\n10:b\n")
+
+        values = self.tp.get_values("3:7", cols="0,2,3")
+        result = "Frequency  50  Hz\nFREQUENCY  60  Hz\nFrEqUeNcY  70  Hz\nfrequency  80  Hz\n"
+        self.assertEqual(renderer.render_table(values), result)
+
+        rows = [["Name", "Value"], ["a", 1.5], ["bbb", -10]]
+        result = f"{CSI}1mName  Value{CSI}0m\na       1.5\nbbb     -10\n"
+        self.assertEqual(TextRenderer(color=True).render_table(rows, header=True), result)
+
+        # By default colors are only added if the cterm output supports ANSI escape sequences.
+        try:
+            Terminal.set_output(ansi=False)
+            self.assertEqual(TextRenderer().render_table(rows, header=True), "Name  Value\na       1.5\nbbb     -10\n")
+            Terminal.set_output(ansi=True)
+            self.assertEqual(TextRenderer().render_table(rows, header=True), result)
+        finally:
+            Terminal.set_output()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,23 +7,62 @@
 # @python:  3.8 or higher
 #######################################################################################
 """
+from array import array
+from itertools import accumulate
 from pathlib import Path
+import codecs
+import functools
+import importlib
+import json
+import os
 import re
+import shutil
+import struct
+import threading
+import time
 
 __version__ = "1.0.0"
 
+# Supported compressed sources: (stdlib module, magic bytes, file extensions).
+_COMPRESSIONS = (
+    ("gzip", b"\x1f\x8b", (".gz", ".gzip")),
+    ("bz2", b"BZh", (".bz2",)),
+    ("lzma", b"\xfd7zXZ\x00", (".xz", ".lzma")),
+)
+
+# Header of shared memory blocks created by Textparser.share: (magic, metadata size, number of lines).
+_SHARED_HEADER = struct.Struct("<4sIQ")
+_SHARED_MAGIC = b"CSTP"
+
+# Serializes attaching to shared memory blocks without registering them at the resource tracker (see attach).
+_TRACKER_LOCK = threading.Lock()
+
+__all__ = ["Textparser", "TextWriter"]
+
 
 class Textparser:
     """Class to perform basic operations like search and data extraction on textfiles."""
 
-    def __init__(self, source):
-        """Initalize Textparser object with data from textfile path or from input string."""
-        self.from_source(source)
+    # Opt-in instrumentation shared by all Textparser objects (see enable_stats).
+    _statsEnabled, _statsHooks, _globalStats, _statsLock = False, [], {}, threading.Lock()
+
+    def __init__(self, source, mode="text", encoding=None, errors="strict"):
+        """Initalize Textparser object with data from textfile path or from input string.
+        See from_source for details on the optional mode, encoding and errors parameters."""
+        self.from_source(source, mode, encoding, errors)
 
     def __repr__(self):
         """Output string representation of the textparser object."""
         return f"<Textparser: Source '{self.source}' with {self.lines} lines>"
 
+    def __enter__(self):
+        """Return textparser object when used as context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close shared memory block used by this object (if any) when leaving the context."""
+        self.close_shared()
+
     @property
     def source(self):
         """Return source of the imported data as string."""
@@ -34,15 +73,98 @@ class Textparser:
         """Return number of textlines from input source."""
         return len(self._lines)
 
-    def from_source(self, source):
+    @property
+    def mode(self):
+        """Return mode ('text' or 'bytes') used to store the textlines from input source."""
+        return self._mode
+
+    @property
+    def stats(self):
+        """Return dict with the counters and timers (seconds) collected for this object while instrumentation
+        is enabled. See enable_stats for details. Call stats.clear() to reset the instance stats."""
+        return vars(self).setdefault("_stats", {})
+
+    @classmethod
+    def enable_stats(cls, enable=True):
+        """Enable (or disable) instrumentation of all Textparser objects. While enabled, the counters and timers
+        listed below are added up per object (tp.stats) and globally (Textparser.global_stats()) and the stats
+        hooks are called after each instrumented operation. Instrumentation is disabled by default.
+        - load: load_calls, load_time, load_bytes, lines_loaded
+        - get_lines, get_values: *_calls, *_time, indices_time, output_bytes (characters of returned strings)
+        - match: match_calls, match_time, lines_scanned, lowercased_lines, regex_evaluations,
+          subpattern_checks, cache_hits (compiled regex cache), matches
+        """
+        cls._statsEnabled = bool(enable)
+
+    @classmethod
+    def add_stats_hook(cls, hook):
+        """Register hook(textparser, operation, counters) called after each instrumented operation, e.g. to
+        forward the counters of the operation to a metrics system. Hooks are only called while stats are enabled."""
+        if hook not in cls._statsHooks:
+            cls._statsHooks.append(hook)
+
+    @classmethod
+    def remove_stats_hook(cls, hook):
+        """Unregister a hook registered via add_stats_hook."""
+        if hook in cls._statsHooks:
+            cls._statsHooks.remove(hook)
+
+    @classmethod
+    def global_stats(cls):
+        """Return copy of the counters and timers collected for all Textparser objects."""
+        with cls._statsLock:
+            return dict(cls._globalStats)
+
+    @classmethod
+    def reset_stats(cls):
+        """Reset the counters and timers collected for all Textparser objects."""
+        with cls._statsLock:
+            cls._globalStats.clear()
+
+    def from_source(self, source, mode="text", encoding=None, errors="strict"):
         """Read all textlines from specified source into memory and store data in _lines.
-        Source can be a valid textfile path or an input string."""
-        self._source, self._lines, sourcePath = "String", [], Path(source)
-        if sourcePath.exists():
-            with sourcePath.open(mode="r") as infile:
-                self._source, self._lines = sourcePath.resolve(), infile.readlines()
+        Source can be a valid textfile path or an input string. Textfiles compressed with gzip, bz2 or xz
+        are detected by their file extension or magic bytes and decompressed on the fly.
+
+        With mode='text', textfiles are decoded while reading using 'encoding' (None:=platform default) and
+        'errors'. With mode='bytes', the textlines are stored and searched as raw bytes and only returned lines
+        and values are decoded using 'encoding' (None:='utf-8') and 'errors'. Case insensitive searches in
+        bytes mode only consider ASCII characters.
+        """
+        self._set_options(mode, encoding, errors)
+        if Textparser._is_file(source):
+            self._read_file(source)
             return
-        self._lines = source.splitlines()
+        self._read_string(source)
+
+    @classmethod
+    def from_file(cls, path, mode="text", encoding=None, errors="strict"):
+        """Return a new Textparser object with all textlines read from the (compressed) textfile path.
+        See from_source for details on the optional mode, encoding and errors parameters."""
+        textparser = cls.__new__(cls)
+        textparser._set_options(mode, encoding, errors)
+        textparser._read_file(path)
+        return textparser
+
+    @classmethod
+    def from_string(cls, text, mode="text", encoding=None, errors="strict"):
+        """Return a new Textparser object with all textlines of the input string (or bytes).
+        Unlike from_source, the input is never checked against the filesystem."""
+        textparser = cls.__new__(cls)
+        textparser._set_options(mode, encoding, errors)
+        textparser._read_string(text)
+        return textparser
+
+    @classmethod
+    def from_stream(cls, stream, mode="text", encoding=None, errors="strict", chunkSize=1 << 20):
+        """Return a new Textparser object with all textlines read from a file-like object like sys.stdin.
+        The stream is consumed in chunks of 'chunkSize' characters (text streams) or bytes (binary streams)
+        via stream.read(chunkSize) until it is exhausted. The stream is not closed afterwards. Binary streams
+        are decoded incrementally in mode='text' using 'encoding' (None:='utf-8') and 'errors'."""
+        textparser = cls.__new__(cls)
+        textparser._set_options(mode, encoding, errors)
+        textparser._read_stream(stream, max(1, int(chunkSize)))
+        return textparser
 
     @staticmethod
     def write(path, lines, append=True):
@@ -50,10 +172,25 @@ class Textparser:
         with Path(path).open(mode="a" if append else "w") as outfile:
             outfile.writelines(lines)
 
+    @staticmethod
+    def open_writer(path, append=True, bufferSize=1 << 16, atomic=False, compression=None, encoding=None):
+        """Return a TextWriter keeping the textfile defined by the path string open for buffered output.
+        See TextWriter for details on the parameters. Use the writer as context manager to close it."""
+        return TextWriter(path, append, bufferSize, atomic, compression, encoding)
+
+    @staticmethod
+    def iter_lines(path, mode="text", encoding=None, errors="strict"):
+        """Yield the textlines of the textfile defined by the path string one by one without loading the
+        whole file into memory. Compressed textfiles (gzip, bz2, xz) are decompressed on the fly.
+        Lines are yielded as strings (mode='text') or raw bytes (mode='bytes'), see from_source."""
+        with Textparser._open_file(path, mode, encoding, errors) as infile:
+            yield from infile
+
     def get_numbered_source_lines(self, output=False, nbrFormat="5d", end="\n"):
         """Return source lines prepend by their corresponding row indices.
         Set output=True to dump the numbered source lines to stdout."""
-        lines = [f"{idx:{nbrFormat}}: " + line.rstrip("\n\r") + end for idx, line in enumerate(self._lines)]
+        sourceLines = self._decode(self._lines)
+        lines = [f"{idx:{nbrFormat}}: " + line.rstrip("\n\r") + end for idx, line in enumerate(sourceLines)]
         if not lines:
             return []
 
@@ -70,22 +207,15 @@ class Textparser:
         Supported row indices: 1, 1.0, '1:10:1,50:100', '1:10:1', '1,2,5', (1, 2, 5), ['1', '2.0', 5.0].
         Note: The 'end' char is omitted for empty output and in case 'end' does not contain '\\n'.
         """
-        rows = Textparser._get_validated_indices(rows)
-        if isinstance(rows, list) and isinstance(rows[0], slice):
-            # Handle multi-slice rows: "1:10, 10:20" --> [slice(1,10,None), slice(10,20,None)].
-            output = "".join([r.rstrip("\n\r") + merge for _slice in rows for r in self._lines[_slice]])
-        elif isinstance(rows, slice):
-            # Handle single slice rows: "1:10:2" --> slice(1,10,2).
-            output = merge.join([line.rstrip("\n\r") for line in self._lines[rows]])
-        else:
-            # Handle number row and string inputs: 1, 1.0, "1", "1,2,3" --> [1], [1], [1], [1, 2, 3].
-            output = merge.join([self._lines[idx].rstrip("\n\r") for idx in rows])
-
-        # Remove last 'merge' char and last 'end' char from output string by default.
-        output = output.rstrip(f"{merge}{end}")
+        if not Textparser._statsEnabled:
+            return self._join_lines(Textparser._get_validated_indices(rows), merge, end)
 
-        # Append 'end' to non empty output strings if it contains '\\n' to ease output to console or file.
-        return f"{output}{end}" if (output and "\n" in end) else output
+        start = time.perf_counter()
+        rows = Textparser._get_validated_indices(rows)
+        parsed = time.perf_counter()
+        output = self._join_lines(rows, merge, end)
+        self._record("get_lines", start, indices_time=parsed - start, output_bytes=len(output))
+        return output
 
     def get_values(self, rows, cols=":", sep=None, merge=" ", end="\n"):
         """Return all values matching the given row and column indices.
@@ -98,8 +228,10 @@ class Textparser:
         By default, column values are joined with 'merge' char, rows are joined with 'end' char. The 'end'
         char is always omitted for single values and for multiple values in case 'end' does not contain '\\n'.
         """
-        cols = Textparser._get_validated_indices(cols)
-        output, input_lines = "", self.get_lines(rows).splitlines()
+        start = time.perf_counter() if Textparser._statsEnabled else None
+        rows, cols = Textparser._get_validated_indices(rows), Textparser._get_validated_indices(cols)
+        parsed = time.perf_counter() if start is not None else None
+        output, input_lines = "", self._join_lines(rows, "\n", "\n").splitlines()
         for line in input_lines:
             if line:
                 # Handle multi-slice cols: "1:10, 10:20" --> [slice(1,10,None), slice(10,20,None)].
@@ -116,7 +248,10 @@ class Textparser:
         output = output.rstrip(f"{merge}{end}")
 
         # Add 'end' char for multiple output values if 'end' contains '\\n' to ease output to console or file.
-        return f"{output}{end}" if ("\n" in end and (merge in output or len(input_lines) > 1)) else output
+        output = f"{output}{end}" if ("\n" in end and (merge in output or len(input_lines) > 1)) else output
+        if start is not None:
+            self._record("get_values", start, indices_time=parsed - start, output_bytes=len(output))
+        return output
 
     def get_match(self, pattern, subpatterns=None, ignoreCase=True):
         """Return tuple with row index and textline of the first row, matching the given main pattern.
@@ -139,29 +274,153 @@ class Textparser:
         Set ignoreCase=False to perform a case sensitive search on all specified search patterns.
         Set findAll=False to return a tuple with row index and textline of the first matching result only.
         """
-        matches, regex = [], Textparser._get_compiled_regex(pattern, ignoreCase)
-        # Loop over all input lines and check for matching patterns.
-        for idx, line in enumerate(self._lines):
-            if not regex and ignoreCase:
-                pattern, line = pattern.lower(), line.lower()
-
-            # Find input lines matching the specified main pattern.
-            if (not regex and pattern in line) or (regex and re.search(regex, line)):
-                # Check if all optional subpatterns match.
-                if not self._do_subpattern_match(idx, subpatterns, ignoreCase):
-                    continue
-
-                if not findAll:
-                    return (idx, self.get_lines(idx))
-                matches.append((idx, self.get_lines(idx)))
+        matches = self._find_matches(pattern, subpatterns, ignoreCase, findAll)
 
         # Ensure consistent API if findAll=False and no match was found.
-        if not findAll and not matches:
-            return (None, None)
+        if not findAll:
+            return matches[0] if matches else (None, None)
 
         # Ensure consistent API if findAll=True although no match was found.
         return matches if matches else [(None, None)]
 
+    @classmethod
+    async def aopen(cls, source, mode="text", encoding=None, errors="strict", executor=None):
+        """Asynchronous counterpart of Textparser(source) returning a new Textparser object.
+        The source is read in an executor (default: asyncio thread pool), so the event loop is not blocked."""
+        # Imported on demand, as asyncio takes longer to import than all other modules used by Textparser.
+        import asyncio
+
+        loader = functools.partial(cls, source, mode, encoding, errors)
+        return await asyncio.get_running_loop().run_in_executor(executor, loader)
+
+    @classmethod
+    async def aopen_all(cls, sources, limit=4, mode="text", encoding=None, errors="strict", executor=None):
+        """Asynchronously create Textparser objects for all sources, returned in the order of the given sources.
+        At most 'limit' sources are loaded concurrently. Cancelling the awaiting task cancels all pending loads."""
+        import asyncio
+
+        semaphore = asyncio.Semaphore(max(1, int(limit)))
+
+        async def _open(source):
+            async with semaphore:
+                return await cls.aopen(source, mode, encoding, errors, executor)
+
+        return await asyncio.gather(*[_open(source) for source in sources])
+
+    async def aget_match(self, pattern, subpatterns=None, ignoreCase=True, chunkSize=10000, executor=None):
+        """Asynchronous counterpart of get_match. See aiter_matches for details on chunkSize and executor."""
+        return await self.aget_matches(pattern, subpatterns, ignoreCase, False, chunkSize, executor)
+
+    async def aget_matches(
+        self, pattern, subpatterns=None, ignoreCase=True, findAll=True, chunkSize=10000, executor=None
+    ):
+        """Asynchronous counterpart of get_matches. See aiter_matches for details on chunkSize and executor."""
+        matches = []
+        async for match in self.aiter_matches(pattern, subpatterns, ignoreCase, chunkSize, executor):
+            if not findAll:
+                return match
+            matches.append(match)
+
+        # Ensure the same return values as get_matches if no match was found.
+        if not findAll:
+            return (None, None)
+        return matches if matches else [(None, None)]
+
+    async def aiter_matches(self, pattern, subpatterns=None, ignoreCase=True, chunkSize=10000, executor=None):
+        """Asynchronously yield tuples with row index and textline for all rows, matching the given main pattern.
+        Patterns and subpatterns are defined as in get_matches. The source lines are scanned in chunks of
+        'chunkSize' rows in an executor (default: asyncio thread pool), so the event loop stays responsive and
+        a cancellation takes effect after the actual chunk. Unlike get_matches, no (None, None) tuple is yielded.
+        """
+        import asyncio
+
+        loop, chunkSize = asyncio.get_running_loop(), max(1, int(chunkSize))
+        for start in range(0, self.lines, chunkSize):
+            matches = await loop.run_in_executor(
+                executor, self._find_matches, pattern, subpatterns, ignoreCase, True, start, start + chunkSize
+            )
+            for match in matches:
+                yield match
+
+    def share(self, name=None):
+        """Publish all textlines into a shared memory block and return the name of the block.
+        Other processes on the same host can attach to the block by name via Textparser.attach(name), so one
+        loaded source serves all worker processes without reloading or pickling the textlines. The block
+        lives until close_shared() is called on this object (or the object is used as context manager).
+        """
+        if getattr(self, "_shared", None):
+            return self._shared.name
+
+        # Imported on demand, as shared memory is only needed when working with multiple processes.
+        from multiprocessing import shared_memory
+
+        # Text lines are stored UTF-8 encoded, lines read in bytes mode are stored as they are.
+        data = self._lines if self._mode == "bytes" else [line.encode("utf-8", "surrogatepass") for line in self._lines]
+        offsets = array("Q", [0])
+        offsets.extend(accumulate(map(len, data)))
+        meta = json.dumps(
+            {"source": str(self._source), "mode": self._mode, "encoding": self._encoding, "errors": self._errors}
+        ).encode("utf-8")
+
+        # Memory layout: header | metadata (padded to 8 bytes) | line offsets | text data.
+        offsetsStart = (_SHARED_HEADER.size + len(meta) + 7) // 8 * 8
+        dataStart = offsetsStart + offsets.itemsize * len(offsets)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=dataStart + offsets[-1])
+        _SHARED_HEADER.pack_into(shm.buf, 0, _SHARED_MAGIC, len(meta), self.lines)
+        shm.buf[_SHARED_HEADER.size : _SHARED_HEADER.size + len(meta)] = meta
+        shm.buf[offsetsStart:dataStart] = offsets.tobytes()
+        shm.buf[dataStart : dataStart + offsets[-1]] = b"".join(data)
+
+        self._shared, self._sharedOwner = shm, True
+        return shm.name
+
+    @classmethod
+    def attach(cls, name):
+        """Return a new read-only Textparser object using the shared memory block published via share().
+        All query methods work directly on the shared memory, lines are only decoded when accessed.
+        Call close_shared() (or use the object as context manager) once the object is no longer needed."""
+        from multiprocessing import shared_memory
+
+        # Processes attaching to a block must not destroy it on exit (Python 3.13+ supports track=False).
+        # Older versions register attached blocks at the resource tracker, which unlinks them when the
+        # attaching process exits, so the block is attached without being registered.
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            shm = _attach_untracked(name)
+
+        magic, metaSize, count = _SHARED_HEADER.unpack_from(shm.buf, 0)
+        if magic != _SHARED_MAGIC:
+            shm.close()
+            raise ValueError(f"Shared memory block '{name}' was not created by Textparser.share().")
+        meta = json.loads(bytes(shm.buf[_SHARED_HEADER.size : _SHARED_HEADER.size + metaSize]))
+
+        textparser = cls.__new__(cls)
+        textparser._set_options(meta["mode"], meta["encoding"], meta["errors"])
+        textparser._source, textparser._shared, textparser._sharedOwner = meta["source"], shm, False
+        offsetsStart = (_SHARED_HEADER.size + metaSize + 7) // 8 * 8
+        textparser._lines = _SharedLines(shm.buf, offsetsStart, count, meta["mode"])
+        return textparser
+
+    def close_shared(self):
+        """Close the shared memory block published via share() or attached via attach().
+        The block is freed if it was published by this object. Attached objects have no lines afterwards."""
+        shm = getattr(self, "_shared", None)
+        if not shm:
+            return
+
+        if isinstance(self._lines, _SharedLines):
+            self._lines.release()
+            self._lines = []
+        shm.close()
+        if self._sharedOwner:
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                # Block was already removed (e.g. by the resource tracker of another process).
+                pass
+        self._shared = None
+
     # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
     # METHODS BELOW SHOULD BE TREATED AS PRIVATE METHODS (IMPLEMENTATION DETAILS)
     # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -193,15 +452,207 @@ class Textparser:
         return [int(float(indices))]
 
     @staticmethod
-    def _get_compiled_regex(pattern, ignoreCase):
-        """Return a compiled regex for the given pattern considering case flag."""
+    def _get_compression(path):
+        """Return the stdlib module name needed to decompress the file at path or None for plain textfiles.
+        Compressed files are detected by their file extension first and by their magic bytes second."""
+        path = Path(path)
+        for codec, _, suffixes in _COMPRESSIONS:
+            if path.suffix.lower() in suffixes:
+                return codec
+
+        with path.open(mode="rb") as infile:
+            header = infile.read(6)
+        for codec, magic, _ in _COMPRESSIONS:
+            if header.startswith(magic):
+                return codec
+        return None
+
+    @staticmethod
+    def _open_file(path, mode="text", encoding=None, errors="strict"):
+        """Return a file object for path, which decompresses gzip, bz2 or xz files in chunks while reading.
+        Files are opened as text file with given encoding and errors, or as binary file if mode='bytes'."""
+        codec = Textparser._get_compression(path)
+        if mode == "bytes":
+            return Path(path).open(mode="rb") if codec is None else importlib.import_module(codec).open(path, mode="rb")
+
+        if codec is None:
+            return Path(path).open(mode="r", encoding=encoding, errors=errors)
+        return importlib.import_module(codec).open(path, mode="rt", encoding=encoding, errors=errors)
+
+    @staticmethod
+    def _is_file(source):
+        """Return True if source should be read from a textfile, otherwise source is treated as input string.
+        Strings which cannot be a file path (empty, multi-line or very long strings) are not checked against
+        the filesystem. Path-like objects are always treated as file paths."""
+        if not isinstance(source, str):
+            return hasattr(source, "__fspath__")
+        if not source or "\n" in source or len(source) > 4096:
+            return False
+
+        try:
+            return Path(source).is_file()
+        except (OSError, ValueError):
+            return False
+
+    def _set_options(self, mode, encoding, errors):
+        """Validate and store the mode, encoding and errors used to read and decode the source lines."""
+        assert mode in ("text", "bytes"), "Param 'mode' must be 'text' or 'bytes'."
+        self._mode, self._encoding, self._errors = mode, encoding, errors
+
+    def _read_file(self, path):
+        """Read all textlines from the (compressed) textfile path into _lines."""
+        start = time.perf_counter() if Textparser._statsEnabled else None
+        with Textparser._open_file(path, self._mode, self._encoding, self._errors) as infile:
+            self._source, self._lines = str(Path(path).resolve()), infile.readlines()
+
+        if start is not None:
+            self._record("load", start, load_bytes=Path(path).stat().st_size, lines_loaded=self.lines)
+
+    def _read_string(self, text):
+        """Split input string (or bytes) into textlines and store them in _lines."""
+        if self._mode == "bytes" and isinstance(text, str):
+            text = text.encode(self._encoding or "utf-8", self._errors)
+        elif self._mode == "text" and isinstance(text, bytes):
+            text = text.decode(self._encoding or "utf-8", self._errors)
+
+        start = time.perf_counter() if Textparser._statsEnabled else None
+        self._source, self._lines = "String", text.splitlines()
+        if start is not None:
+            self._record("load", start, load_bytes=len(text), lines_loaded=self.lines)
+
+    def _read_stream(self, stream, chunkSize):
+        """Read all textlines from the file-like object in chunks into _lines. Lines keep their line ends."""
+        start = time.perf_counter() if Textparser._statsEnabled else None
+        lines, decoder, size = [], None, 0
+        newline = b"\n" if self._mode == "bytes" else "\n"
+        rest = newline[:0]
+        while True:
+            chunk = stream.read(chunkSize)
+            if not chunk:
+                break
+            size += len(chunk)
+
+            # Convert chunks from text streams to bytes or decode chunks from binary streams if needed.
+            if self._mode == "bytes" and isinstance(chunk, str):
+                chunk = chunk.encode(self._encoding or "utf-8", self._errors)
+            elif self._mode == "text" and not isinstance(chunk, str):
+                decoder = decoder or codecs.getincrementaldecoder(self._encoding or "utf-8")(self._errors)
+                chunk = decoder.decode(chunk)
+
+            # Keep the last incomplete line until the next chunk or the end of the stream is reached.
+            parts = (rest + chunk).split(newline)
+            rest = parts.pop()
+            lines.extend([part + newline for part in parts])
+
+        if decoder:
+            rest += decoder.decode(b"", final=True)
+        if rest:
+            lines.append(rest)
+        self._source, self._lines = "Stream", lines
+        if start is not None:
+            self._record("load", start, load_bytes=size, lines_loaded=self.lines)
+
+    def _record(self, operation, start, **counters):
+        """Add the counters and the time elapsed since the perf_counter value 'start' to the instance and global
+        stats and pass the counters of the operation to all registered stats hooks."""
+        counters[f"{operation}_calls"], counters[f"{operation}_time"] = 1, time.perf_counter() - start
+        with Textparser._statsLock:
+            for stats in (self.stats, Textparser._globalStats):
+                for key, value in counters.items():
+                    stats[key] = stats.get(key, 0) + value
+
+        for hook in list(Textparser._statsHooks):
+            hook(self, operation, counters)
+
+    def _decode(self, lines):
+        """Return the given source lines as strings, decoding lines stored in bytes mode."""
+        if self._mode != "bytes":
+            return lines
+        return [line.decode(self._encoding or "utf-8", self._errors) for line in lines]
+
+    def _get_search_pattern(self, pattern, ignoreCase):
+        """Return tuple with search pattern and compiled regex (None for plain patterns) matching the mode
+        the source lines are stored in. Plain patterns are lowercased if ignoreCase is set."""
+        encoding = (self._encoding or "utf-8") if self._mode == "bytes" else None
+        regex = Textparser._get_compiled_regex(pattern, ignoreCase, encoding)
+        if not regex and encoding:
+            pattern = pattern.encode(encoding, self._errors)
+        if not regex and ignoreCase:
+            pattern = pattern.lower()
+        return pattern, regex
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _get_compiled_regex(pattern, ignoreCase, encoding=None):
+        """Return a compiled regex for the given pattern considering case flag.
+        The regex is compiled from the encoded pattern to search bytes if an encoding is specified."""
         regex = pattern[3:]
         if not pattern.startswith("rx:") or not regex:
             return None
 
+        if encoding:
+            regex = regex.encode(encoding)
+
         # Create a compiled reges from given pattern.
         return re.compile(regex, re.IGNORECASE) if ignoreCase else re.compile(regex)
 
+    def _join_lines(self, rows, merge, end):
+        """Return the source lines defined by the validated row indices joined by 'merge' char (see get_lines)."""
+        if isinstance(rows, list) and isinstance(rows[0], slice):
+            # Handle multi-slice rows: "1:10, 10:20" --> [slice(1,10,None), slice(10,20,None)].
+            output = "".join([r.rstrip("\n\r") + merge for _slice in rows for r in self._decode(self._lines[_slice])])
+        elif isinstance(rows, slice):
+            # Handle single slice rows: "1:10:2" --> slice(1,10,2).
+            output = merge.join([line.rstrip("\n\r") for line in self._decode(self._lines[rows])])
+        else:
+            # Handle number row and string inputs: 1, 1.0, "1", "1,2,3" --> [1], [1], [1], [1, 2, 3].
+            output = merge.join([line.rstrip("\n\r") for line in self._decode([self._lines[idx] for idx in rows])])
+
+        # Remove last 'merge' char and last 'end' char from output string by default.
+        output = output.rstrip(f"{merge}{end}")
+
+        # Append 'end' to non empty output strings if it contains '\\n' to ease output to console or file.
+        return f"{output}{end}" if (output and "\n" in end) else output
+
+    def _find_matches(self, pattern, subpatterns, ignoreCase, findAll=True, start=0, stop=None):
+        """Return list of tuples with row index and textline of the rows [start:stop] matching all patterns.
+        The search stops after the first matching row if findAll=False."""
+        if Textparser._statsEnabled:
+            timer, cacheHits = time.perf_counter(), Textparser._get_compiled_regex.cache_info().hits
+        matches, checks, (pattern, regex) = [], 0, self._get_search_pattern(pattern, ignoreCase)
+
+        # Loop over all requested input lines and check for matching patterns.
+        lines = self._lines if (start == 0 and stop is None) else self._lines[start:stop]
+        for idx, line in enumerate(lines, start):
+            if not regex and ignoreCase:
+                line = line.lower()
+
+            # Find input lines matching the specified main pattern.
+            if (not regex and pattern in line) or (regex and re.search(regex, line)):
+                # Check if all optional subpatterns match.
+                checks += 1
+                if not self._do_subpattern_match(idx, subpatterns, ignoreCase):
+                    continue
+
+                matches.append((idx, self._join_lines([idx], "\n", "\n")))
+                if not findAll:
+                    break
+
+        if Textparser._statsEnabled:
+            # Counters are derived after the loop, so the hot loop itself stays free of instrumentation code.
+            scanned = (matches[-1][0] + 1 - start) if (matches and not findAll) else len(lines)
+            self._record(
+                "match",
+                timer,
+                lines_scanned=scanned,
+                lowercased_lines=scanned if (not regex and ignoreCase) else 0,
+                regex_evaluations=scanned if regex else 0,
+                subpattern_checks=checks if subpatterns else 0,
+                cache_hits=Textparser._get_compiled_regex.cache_info().hits - cacheHits,
+                matches=len(matches),
+            )
+        return matches
+
     def _do_subpattern_match(self, row, subpatterns, ignoreCase):
         """Return True if all defined subpattern do match, otherwise False.
         Subpatterns are Tuples with (rowOffset, subpattern) evaluated relative to the main pattern."""
@@ -219,13 +670,183 @@ class Textparser:
                 return False
 
             # Extract subline from source defined by row offset and create compiled regex if needed.
-            subpattern, subline = str(subpattern), self._lines[rowIdx]
-            regex = Textparser._get_compiled_regex(subpattern, ignoreCase)
+            subpattern, regex = self._get_search_pattern(str(subpattern), ignoreCase)
+            subline = self._lines[rowIdx]
             if not regex and ignoreCase:
-                subpattern, subline = subpattern.lower(), subline.lower()
+                subline = subline.lower()
 
             # Check if actual subpattern matches the source line defined by row offset.
             if not ((not regex and subpattern in subline) or (regex and re.search(regex, subline))):
                 return False
 
         return True
+
+
+class TextWriter:
+    """Buffered writer for textfiles, which keeps the output file open until the writer is closed."""
+
+    def __init__(self, path, append=True, bufferSize=1 << 16, atomic=False, compression=None, encoding=None):
+        """Open textfile defined by the path string for writing (append=False) or appending (append=True).
+        Output is collected in memory and written in one call once 'bufferSize' characters are buffered.
+        With atomic=True, output goes to a temporary file in the target folder, which replaces the target
+        file on close, so readers never see partial output. Compression can be 'gzip', 'bz2' or 'lzma'
+        (None:=detect from file extension like '.gz', '.bz2' or '.xz', False:=never compress).
+
+        Instead of a path, an open text stream like sys.stdout can be passed in. The stream is only buffered
+        and flushed by the writer, but never closed. All other parameters are ignored for streams."""
+        self._bufferSize, self._atomic = max(1, int(bufferSize)), atomic
+        self._buffer, self._buffered, self._tmpPath, self._ownsFile = [], 0, None, True
+        if hasattr(path, "write"):
+            self._path, self._outfile, self._atomic, self._ownsFile = None, path, False, False
+            return
+
+        self._path = Path(path)
+
+        if compression is None:
+            compression = next(
+                (codec for codec, _, suffixes in _COMPRESSIONS if self._path.suffix.lower() in suffixes), None
+            )
+
+        # Write atomic output into a temporary file, starting with the actual content when appending.
+        target = self._path
+        if atomic:
+            self._tmpPath = target = _create_temp_file(self._path.resolve())
+
+        try:
+            # Temporary files get the default mode of new files, so existing targets keep their mode.
+            if atomic and self._path.exists():
+                shutil.copymode(self._path, target)
+                if append:
+                    shutil.copyfile(self._path, target)
+
+            mode = "a" if append else "w"
+            if compression:
+                self._outfile = importlib.import_module(compression).open(target, mode=f"{mode}t", encoding=encoding)
+            else:
+                self._outfile = target.open(mode=mode, encoding=encoding)
+        except BaseException:
+            if self._tmpPath:
+                self._tmpPath.unlink()
+            raise
+
+    def __enter__(self):
+        """Return writer object when used as context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close writer. Atomic output is discarded if the context was left due to an exception."""
+        self.close(discard=exc_type is not None and self._atomic)
+
+    @property
+    def closed(self):
+        """Return True if the writer was closed."""
+        return self._outfile is None
+
+    def write(self, data):
+        """Write a string or all strings of an iterable like a list or a generator to the textfile.
+        No line ends are added, so strings must contain their line ends like with file.writelines."""
+        if isinstance(data, str):
+            data = (data,)
+
+        for text in data:
+            self._buffer.append(text)
+            self._buffered += len(text)
+            if self._buffered >= self._bufferSize:
+                self.flush()
+
+    def flush(self):
+        """Write all buffered output to the textfile with a single write call."""
+        if self._buffer:
+            self._outfile.write("".join(self._buffer))
+            self._buffer, self._buffered = [], 0
+
+    def close(self, discard=False):
+        """Flush buffered output and close the textfile. Atomic output replaces the target file on close,
+        unless discard=True is set, which removes the temporary file leaving the target file untouched."""
+        if self._outfile is None:
+            return
+
+        try:
+            if not discard:
+                self.flush()
+        finally:
+            if self._ownsFile:
+                self._outfile.close()
+            else:
+                self._outfile.flush()
+            self._outfile = None
+
+        if self._tmpPath and discard:
+            self._tmpPath.unlink()
+        elif self._tmpPath:
+            os.replace(self._tmpPath, self._path)
+
+
+def _create_temp_file(path):
+    """Return path of a new empty temporary file in the folder of path. Unlike tempfile.mkstemp (mode 0600), the
+    file is created with mode 0666 reduced by the umask of the process like any new file."""
+    while True:
+        tmpPath = path.parent / f".{path.name}.{os.urandom(6).hex()}.tmp"
+        try:
+            os.close(os.open(tmpPath, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666))
+            return tmpPath
+        except FileExistsError:
+            continue
+
+
+def _attach_untracked(name):
+    """Return SharedMemory object attached to an existing block, which is not registered at the resource tracker.
+    Unregistering the block afterwards is no option, as forked processes share the tracker of the owner."""
+    from multiprocessing import resource_tracker, shared_memory
+
+    with _TRACKER_LOCK:
+        register = resource_tracker.register
+
+        def _register(trackedName, rtype):
+            if rtype != "shared_memory" or trackedName.lstrip("/") != name.lstrip("/"):
+                register(trackedName, rtype)
+
+        resource_tracker.register = _register
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class _SharedLines:
+    """Read-only sequence of source lines stored in a shared memory block created by Textparser.share."""
+
+    def __init__(self, buffer, offsetsStart, count, mode):
+        """Create views on the line offsets and text data of the shared memory buffer."""
+        self._offsets = buffer[offsetsStart : offsetsStart + 8 * (count + 1)].cast("Q")
+        self._data = buffer[offsetsStart + 8 * (count + 1) :]
+        self._count, self._bytes = count, mode == "bytes"
+
+    def __len__(self):
+        """Return number of lines."""
+        return self._count
+
+    def __getitem__(self, index):
+        """Return a single line for an integer index or a list of lines for a slice."""
+        if isinstance(index, slice):
+            return [self._get_line(idx) for idx in range(*index.indices(self._count))]
+
+        idx = index + self._count if index < 0 else index
+        if not 0 <= idx < self._count:
+            raise IndexError("list index out of range")
+        return self._get_line(idx)
+
+    def __iter__(self):
+        """Yield all lines in order."""
+        for idx in range(self._count):
+            yield self._get_line(idx)
+
+    def release(self):
+        """Release the views on the shared memory buffer, so the block can be closed."""
+        self._offsets.release()
+        self._data.release()
+
+    def _get_line(self, idx):
+        """Return line idx as bytes or as decoded string."""
+        line = self._data[self._offsets[idx] : self._offsets[idx + 1]]
+        return bytes(line) if self._bytes else str(line, "utf-8", "surrogatepass")
@@ -0,0 +1,180 @@
+"""
+#######################################################################################
+# Module to render results of the Textparser class as text, e.g. search results with
+# highlighted hits and row indices or column values as table with aligned columns.
+# All rows are composed in a single pass into one string (or a few large chunks) using
+# precomputed cterm escape sequences, so no terminal call is needed per hit or cell.
+#
+# @module:  textrender
+# @author:  cwsoft
+# @python:  3.8 or higher
+#######################################################################################
+"""
+import functools
+import re
+import sys
+
+from .cterm import Colors, Styles, Terminal, TerminalState
+from .textparser import TextWriter
+
+__version__ = "1.0.0"
+
+__all__ = ["TextRenderer"]
+
+
+class TextRenderer:
+    """Renders Textparser results with optional ANSI colors, row indices and filename prefix.
+    Example:
+        renderer = TextRenderer(color=True, lineNumbers=True)
+        renderer.write(renderer.iter_matches(tp.get_matches("rx:freq\\w+"), "rx:freq\\w+"))
+    """
+
+    def __init__(
+        self,
+        color=None,
+        lineNumbers=False,
+        name=None,
+        ignoreCase=True,
+        hitColor=Colors.RED,
+        rowColor=Colors.GREEN,
+        nameColor=Colors.MAGENTA,
+    ):
+        """Initialize renderer. Set color=False to render plain text, color=True to add ANSI colors, or color=None
+        to add colors only if the cterm output supports them (see Terminal.set_output). Set lineNumbers=True to
+        prefix rows with their row index and name (e.g. a filename) to prefix each row with 'name:'. Hits of
+        search patterns are matched case insensitive if ignoreCase is True. Colors must be of Enum cterm.Colors,
+        hits are rendered bold."""
+        color = Terminal._ansi if color is None else color
+        self._color, self._lineNumbers, self._ignoreCase = color, lineNumbers, ignoreCase
+
+        # Escape sequences are composed once, so rendering a row only joins precomputed strings.
+        reset = TerminalState().get_sequence(styles=Styles.RESET) if color else ""
+        self._hit = (TerminalState().get_sequence(hitColor, styles=Styles.BOLD), reset) if color else ("", "")
+        self._row = (TerminalState().get_sequence(rowColor), reset) if color else ("", "")
+        self._bold = (TerminalState().get_sequence(styles=Styles.BOLD), reset) if color else ("", "")
+        if name is None:
+            self._prefix = ""
+        else:
+            self._prefix = f"{TerminalState().get_sequence(nameColor)}{name}{reset}:" if color else f"{name}:"
+
+    def format_row(self, row, line, pattern=None):
+        """Return single output row with optional name prefix, row index and highlighted hits of pattern."""
+        return self._format_row(row, line, self._get_highlighter(pattern))
+
+    def render_matches(self, matches, pattern=None):
+        """Return string with all rows of the (row, line) tuples returned by Textparser.get_matches or get_match.
+        Hits of pattern (plain text or 'rx:' regex) are highlighted. Tuples with row index None are skipped."""
+        return "".join(self._iter_rows(matches, pattern))
+
+    def iter_matches(self, matches, pattern=None, chunkSize=1 << 16):
+        """Yield the output of render_matches in chunks of about chunkSize characters, e.g. for large results."""
+        chunk, size = [], 0
+        for output in self._iter_rows(matches, pattern):
+            chunk.append(output)
+            size += len(output)
+            if size >= chunkSize:
+                yield "".join(chunk)
+                chunk, size = [], 0
+
+        if chunk:
+            yield "".join(chunk)
+
+    def render_lines(self, lines, start=0, pattern=None):
+        """Return string with consecutive lines (a string or list as returned by Textparser.get_lines or lines)
+        prefixed by their row indices starting at start, right aligned to the width of the last row index."""
+        lines = lines.splitlines() if isinstance(lines, str) else lines
+        width = len(str(start + len(lines) - 1)) if lines else 0
+        highlighter, (rowStart, rowEnd) = self._get_highlighter(pattern), self._row
+        output = []
+        for row, line in enumerate(lines, start):
+            line = highlighter(line.rstrip("\n\r"))
+            output.append(f"{self._prefix}{rowStart}{row:{width}d}{rowEnd}:{line}\n")
+        return "".join(output)
+
+    def render_table(self, values, sep=None, header=False):
+        """Return string with the rows of values as table with aligned columns, separated by two blanks.
+        Values can be a string as returned by Textparser.get_values, with columns split by sep (None:=whitespace),
+        or a list of rows, each a list of column values. Numeric columns are aligned to the right.
+        Set header=True to render the first row in bold, which is then ignored for the numeric column check."""
+        rows = [line.split(sep) for line in values.splitlines()] if isinstance(values, str) else values
+        rows = [[str(value) for value in row] for row in rows]
+        if not rows:
+            return ""
+
+        cols = max([len(row) for row in rows])
+        rows = [row + [""] * (cols - len(row)) for row in rows]
+        widths = [max([len(row[col]) for row in rows]) for col in range(cols)]
+        data = rows[1:] if header else rows
+        numeric = [all([_is_number(row[col]) for row in data if row[col]]) for col in range(cols)]
+
+        output = []
+        for idx, row in enumerate(rows):
+            aligned = [
+                value.rjust(width) if isNumber and not (header and idx == 0) else value.ljust(width)
+                for value, width, isNumber in zip(row, widths, numeric)
+            ]
+            line = "  ".join(aligned).rstrip()
+            if header and idx == 0:
+                line = f"{self._bold[0]}{line}{self._bold[1]}"
+            output.append(f"{self._prefix}{line}\n")
+        return "".join(output)
+
+    def write(self, output, stream=None, bufferSize=1 << 16):
+        """Write a rendered string or an iterable of chunks (e.g. of iter_matches) to the given text stream
+        (default: sys.stdout) in chunks of at least bufferSize characters and flush the stream."""
+        with TextWriter(stream or sys.stdout, bufferSize=bufferSize) as writer:
+            writer.write(output)
+
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    # METHODS BELOW SHOULD BE TREATED AS PRIVATE METHODS (IMPLEMENTATION DETAILS)
+    # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+    def _iter_rows(self, matches, pattern):
+        """Yield output rows of all (row, line) tuples with a row index."""
+        matches = [matches] if isinstance(matches, tuple) else matches
+        highlighter = self._get_highlighter(pattern)
+        for row, line in matches:
+            if row is not None:
+                yield self._format_row(row, line, highlighter)
+
+    def _format_row(self, row, line, highlighter):
+        """Return output row with prefix, optional row index and line processed by the highlighter."""
+        line = highlighter(line.rstrip("\n\r"))
+        if self._lineNumbers:
+            return f"{self._prefix}{self._row[0]}{row}{self._row[1]}:{line}\n"
+        return f"{self._prefix}{line}\n"
+
+    def _get_highlighter(self, pattern):
+        """Return function wrapping all hits of the pattern in a line into the hit color sequences."""
+        if not (self._color and pattern):
+            return _keep
+
+        regex = _get_regex(pattern, self._ignoreCase)
+        start, end = self._hit
+        if regex.search("") is None:
+            # Template substitution avoids a Python call per hit, but would also wrap empty hits.
+            return functools.partial(regex.sub, f"{start}\\g<0>{end}")
+        return functools.partial(regex.sub, lambda hit: f"{start}{hit.group(0)}{end}" if hit.group(0) else "")
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# FUNCTIONS BELOW SHOULD BE TREATED AS PRIVATE FUNCTIONS (IMPLEMENTATION DETAILS)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+@functools.lru_cache(maxsize=256)
+def _get_regex(pattern, ignoreCase):
+    """Return cached compiled regex of a search pattern (plain text or regex with 'rx:' prefix)."""
+    regex = pattern[3:] if (pattern.startswith("rx:") and pattern[3:]) else re.escape(pattern)
+    return re.compile(regex, re.IGNORECASE) if ignoreCase else re.compile(regex)
+
+
+def _keep(line):
+    """Return line unchanged (highlighter used without colors or pattern)."""
+    return line
+
+
+def _is_number(value):
+    """Return True if value can be converted into a float (e.g. '42', '-1.5e3')."""
+    try:
+        float(value)
+    except ValueError:
+        return False
+    return True
@@ -26,4 +26,5 @@ setuptools.setup(
         "Operating System :: OS Independent",
     ],
     python_requires=">=3.8",
+    entry_points={"console_scripts": ["csutils=csutils.cli:main"]},
 )